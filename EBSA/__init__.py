@@ -25,6 +25,8 @@ from .data_types import InputBatch
 from .data_types import Output
 from .data_types import OutputBatch
 
+from .compilation import CompiledPredictor
+
 from .loads import load
 from .loads import load_examples
 
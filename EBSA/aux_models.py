@@ -6,7 +6,7 @@ import numpy as np
 import tensorflow as tf
 from transformers import PretrainedConfig
 
-from .data_types import Pattern, TokenizedExample, Output
+from .data_types import Pattern, TokenizedExample, Output, OutputRequirements
 from . import alignment
 
 
@@ -15,6 +15,14 @@ class ReferenceRecognizer(ABC):
     Referans tanıma için soyut sınıf.
     """
 
+    @property
+    def requirements(self) -> OutputRequirements:
+        """
+        Tanıyıcının ihtiyaç duyduğu model çıktıları. Varsayılan olarak tüm ayrıntılar istenir;
+        alt sınıflar yalnızca kullandıklarını belirterek çıkarım maliyetini düşürebilir.
+        """
+        return OutputRequirements.everything()
+
     @abstractmethod
     def __call__(
             self,
@@ -29,6 +37,14 @@ class PatternRecognizer(ABC):
     Pattern (desen) tanıma için soyut sınıf.
     """
 
+    @property
+    def requirements(self) -> OutputRequirements:
+        """
+        Tanıyıcının ihtiyaç duyduğu model çıktıları. Varsayılan olarak tüm ayrıntılar istenir;
+        alt sınıflar yalnızca kullandıklarını belirterek çıkarım maliyetini düşürebilir.
+        """
+        return OutputRequirements.everything()
+
     @abstractmethod
     def __call__(
             self,
@@ -45,6 +61,13 @@ class BasicReferenceRecognizer(ReferenceRecognizer, PretrainedConfig):
     weights: Tuple[float, float]
     model_type: str = 'reference_recognizer'
 
+    @property
+    def requirements(self) -> OutputRequirements:
+        """
+        Yalnızca ilk (gömme) katmanın gizli durumları kullanılır.
+        """
+        return OutputRequirements(hidden_layers=(0,))
+
     def __call__(
             self,
             example: TokenizedExample,
@@ -124,6 +147,13 @@ class BasicPatternRecognizer(PatternRecognizer):
     is_rounded: bool = True
     round_decimals: int = 2
 
+    @property
+    def requirements(self) -> OutputRequirements:
+        """
+        Yalnızca katmanlar ve kafalar üzerinden toplanmış dikkat × |gradyan| çarpımı kullanılır.
+        """
+        return OutputRequirements(attention_products=True)
+
     def __call__(
             self,
             example: TokenizedExample,
@@ -161,8 +191,11 @@ class BasicPatternRecognizer(PatternRecognizer):
         Returns:
         Tuple[np.ndarray, np.ndarray]: Ağırlıklar ve desen vektörleri.
         """
-        x = output.attentions * tf.abs(output.attention_grads)
-        x = tf.reduce_sum(x, axis=[0, 1], keepdims=True)
+        if output.attention_products is not None:
+            x = output.attention_products[tf.newaxis, tf.newaxis, ...]
+        else:
+            x = output.attentions * tf.abs(output.attention_grads)
+            x = tf.reduce_sum(x, axis=[0, 1], keepdims=True)
         x = alignment.merge_tensor(x, alignment=token_subtoken_alignment)
         x = x.numpy().squeeze(axis=(0, 1))
 
@@ -0,0 +1,120 @@
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Tuple
+
+import tensorflow as tf
+
+from .data_types import InputBatch
+from .models import ABSClassifier
+
+# Logger ayarları
+logger = logging.getLogger('absa.compilation')
+
+SEQUENCE_BUCKETS = (16, 32, 64, 128, 256, 512)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+# Uygulama başlangıcında önceden derlenen, tweet boyutundaki istekler için yaygın şekiller
+COMMON_SEQUENCE_LENGTHS = (16, 32, 64, 128)
+COMMON_BATCH_SIZES = (1, 2, 4, 8)
+
+def bucket(value: int, buckets: Tuple[int, ...]) -> int:
+    """
+    Değeri içine sığdığı en küçük kovaya yuvarlar.
+
+    Args:
+        value (int): Yuvarlanacak değer.
+        buckets (Tuple[int, ...]): Artan sırada kova boyutları.
+
+    Returns:
+        int: Kova boyutu. Değer en büyük kovadan büyükse en büyük kova.
+    """
+    for size in buckets:
+        if value <= size:
+            return size
+    return buckets[-1]
+
+@dataclass
+class CompiledPredictor:
+    """
+    Skor hesaplamasını `tf.function` (isteğe bağlı olarak XLA) ile derler. Girdiler sabit
+    dizi uzunluğu ve batch boyutu kovalarına doldurulduğu için her kova şekli yalnızca bir kez
+    derlenir ve sonraki isteklerde aynı graf yeniden kullanılır.
+
+    stats: Derleme ("traces"), çağrı ("calls") ve kova isabet ("bucket_hits") sayıları.
+    """
+    model: ABSClassifier
+    jit_compile: bool = False
+    sequence_buckets: Tuple[int, ...] = SEQUENCE_BUCKETS
+    batch_buckets: Tuple[int, ...] = BATCH_BUCKETS
+    stats: Dict = field(default_factory=lambda: {'traces': 0, 'calls': 0, 'bucket_hits': Counter()})
+
+    def __post_init__(self):
+        self._function = tf.function(self._scores, jit_compile=self.jit_compile)
+        self._concrete = {}
+
+    def _scores(self, token_ids: tf.Tensor, attention_mask: tf.Tensor, token_type_ids: tf.Tensor) -> tf.Tensor:
+        """
+        Derlenen fonksiyon. Python kodu yalnızca iz sürme (tracing) sırasında çalıştığı için sayaç
+        her yeni derlemede bir artar.
+        """
+        self.stats['traces'] += 1
+        logits, _, _ = self.model.call(
+            input_ids=token_ids,
+            attention_mask=attention_mask,
+            token_type_ids=token_type_ids,
+            output_attentions=False,
+            output_hidden_states=False
+        )
+        return tf.nn.softmax(logits, axis=1)
+
+    def concrete_function(self, batch_size: int, sequence_length: int):
+        """
+        Verilen kova şekli için sabit girdi imzalı derlenmiş fonksiyonu döndürür.
+        """
+        shape = (batch_size, sequence_length)
+        function = self._concrete.get(shape)
+        if function is None:
+            spec = tf.TensorSpec(shape, tf.int32)
+            function = self._concrete[shape] = self._function.get_concrete_function(spec, spec, spec)
+            logger.info(f'{shape} şekli için tahmin fonksiyonu derlendi.')
+        return function
+
+    def __call__(self, input_batch: InputBatch) -> tf.Tensor:
+        """
+        Batch'i kovalara doldurarak derlenmiş fonksiyonla skorları hesaplar. En büyük batch
+        kovasından büyük batch'ler parçalara bölünür.
+
+        Returns:
+            tf.Tensor: [B, 3] boyutunda skorlar.
+        """
+        inputs = [tf.cast(x, tf.int32) for x in (input_batch.token_ids, input_batch.attention_mask, input_batch.token_type_ids)]
+        num_examples, length = inputs[0].shape
+        sequence_length = max(length, bucket(length, self.sequence_buckets))
+        step = self.batch_buckets[-1]
+
+        scores = []
+        for start in range(0, num_examples, step):
+            chunk = [x[start:start + step] for x in inputs]
+            size = chunk[0].shape[0]
+            batch_size = bucket(size, self.batch_buckets)
+            # Doldurulan tokenların dikkat maskesi 0 olduğu için skorlar değişmez; eklenen satırlar atılır
+            padding = [[0, batch_size - size], [0, sequence_length - length]]
+            chunk = [tf.pad(x, padding) for x in chunk]
+            self.stats['calls'] += 1
+            self.stats['bucket_hits'][(batch_size, sequence_length)] += 1
+            scores.append(self.concrete_function(batch_size, sequence_length)(*chunk)[:size])
+        return tf.concat(scores, axis=0)
+
+    def warm_up(self, batch_sizes: Iterable[int] = COMMON_BATCH_SIZES, sequence_lengths: Iterable[int] = COMMON_SEQUENCE_LENGTHS):
+        """
+        Yaygın kova şekillerini önceden derler ve bir kez çalıştırır (XLA derlemesi ilk çalıştırmada yapılır).
+
+        Args:
+            batch_sizes (Iterable[int]): Derlenecek batch boyutları.
+            sequence_lengths (Iterable[int]): Derlenecek dizi uzunlukları.
+        """
+        for batch_size in batch_sizes:
+            for sequence_length in sequence_lengths:
+                inputs = tf.zeros((batch_size, sequence_length), tf.int32)
+                self.concrete_function(batch_size, sequence_length)(inputs, tf.ones_like(inputs), inputs)
@@ -1,6 +1,6 @@
 from enum import IntEnum
 from dataclasses import asdict, dataclass
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import tensorflow as tf
 
@@ -188,26 +188,91 @@ class InputBatch:
     token_type_ids: tf.Tensor
 
 
+@dataclass(frozen=True)
+class OutputRequirements:
+    """
+    Bir tanıyıcının (recognizer) ihtiyaç duyduğu model çıktıları.
+
+    hidden_layers: İstenen gizli durum katmanları (None ise tüm katmanlar). Çıktıda katman numaraları
+        korunur: `hidden_states[:, k]` her zaman k. katmandır, istenmeyen katmanlar sıfırdır ve istenen en
+        büyük katmandan sonraki katmanlar bulunmaz.
+    attentions: Tüm katman ve kafalardaki dikkat ağırlıkları.
+    attention_grads: Dikkat ağırlıklarının gradyanları.
+    attention_products: Dikkat × |gradyan| çarpımının katmanlar ve kafalar üzerinden toplamı.
+    """
+    hidden_layers: Optional[Tuple[int, ...]] = ()
+    attentions: bool = False
+    attention_grads: bool = False
+    attention_products: bool = False
+
+    @classmethod
+    def everything(cls) -> 'OutputRequirements':
+        """
+        Tüm ayrıntıları isteyen gereksinimler (gereksinimlerini belirtmeyen tanıyıcılar için).
+        """
+        return cls(hidden_layers=None, attentions=True, attention_grads=True, attention_products=True)
+
+    def __or__(self, other: 'OutputRequirements') -> 'OutputRequirements':
+        """
+        İki gereksinimi birleştirir.
+        """
+        if self.hidden_layers is None or other.hidden_layers is None:
+            hidden_layers = None
+        else:
+            hidden_layers = tuple(sorted(set(self.hidden_layers) | set(other.hidden_layers)))
+        return OutputRequirements(
+            hidden_layers=hidden_layers,
+            attentions=self.attentions or other.attentions,
+            attention_grads=self.attention_grads or other.attention_grads,
+            attention_products=self.attention_products or other.attention_products
+        )
+
+    @property
+    def needs_hidden_states(self) -> bool:
+        """
+        Gizli durumların gerekip gerekmediği.
+        """
+        return self.hidden_layers is None or len(self.hidden_layers) > 0
+
+    @property
+    def needs_gradients(self) -> bool:
+        """
+        Geri yayılımın (dikkat gradyanlarının) gerekip gerekmediği.
+        """
+        return self.attention_grads or self.attention_products
+
+    @property
+    def needs_details(self) -> bool:
+        """
+        Skorlar dışında herhangi bir çıktının gerekip gerekmediği.
+        """
+        return self.needs_hidden_states or self.attentions or self.needs_gradients
+
+
 @dataclass(frozen=True)
 class Output:
     """
-    Model çıktısı sınıfı.
+    Model çıktısı sınıfı. Açıklama gerektirmeyen çıkarımda yalnızca skorlar bulunur,
+    diğer alanlar None olur.
     """
     scores: tf.Tensor  
-    hidden_states: tf.Tensor
-    attentions: tf.Tensor
-    attention_grads: tf.Tensor 
+    hidden_states: tf.Tensor = None
+    attentions: tf.Tensor = None
+    attention_grads: tf.Tensor = None
+    attention_products: tf.Tensor = None
 
 
 @dataclass(frozen=True)
 class OutputBatch:
     """
-    Model batch çıktısı sınıfı.
+    Model batch çıktısı sınıfı. Açıklama gerektirmeyen çıkarımda yalnızca skorlar bulunur,
+    diğer alanlar None olur.
     """
     scores: tf.Tensor 
-    hidden_states: tf.Tensor 
-    attentions: tf.Tensor 
-    attention_grads: tf.Tensor 
+    hidden_states: tf.Tensor = None
+    attentions: tf.Tensor = None
+    attention_grads: tf.Tensor = None
+    attention_products: tf.Tensor = None
 
     def __getitem__(self, i: int) -> Output:
         """
@@ -219,11 +284,13 @@ class OutputBatch:
         Returns:
         Output: Çıktı.
         """
+        take = lambda x: x[i] if x is not None else None
         return Output(
             self.scores[i],
-            self.hidden_states[i],
-            self.attentions[i],
-            self.attention_grads[i]
+            take(self.hidden_states),
+            take(self.attentions),
+            take(self.attention_grads),
+            take(self.attention_products)
         )
 
     def __iter__(self) -> Iterable[Output]:
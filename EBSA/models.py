@@ -28,6 +28,8 @@ class ABSClassifier(tf.keras.Model, ABC):
 def force_to_return_details(kwargs: dict):
     """
     Modelin dikkat (attention) ve gizli durumları (hidden states) döndürmesini sağlar.
+    Bu yalnızca varsayılan davranıştır; çağrıda `output_attentions=False` ve
+    `output_hidden_states=False` verilerek ayrıntılar kapatılabilir (bkz. `Pipeline.predict_scores`).
     
     Args:
     kwargs (dict): Modelin argümanları.
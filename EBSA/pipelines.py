@@ -1,8 +1,8 @@
 import logging
 from abc import ABC, abstractmethod
 from collections import OrderedDict
-from dataclasses import dataclass
-from typing import Callable, Iterable, List
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Tuple
 
 import numpy as np
 import tensorflow as tf
@@ -11,6 +11,7 @@ import transformers
 from . import alignment
 from . import utils
 from .data_types import TokenizedExample, Example, LabeledExample, PredictedExample, SubTask, CompletedSubTask, Task, CompletedTask, InputBatch, OutputBatch, Sentiment
+from .compilation import CompiledPredictor
 from .models import BertABSClassifier
 from .training import classifier_loss
 from .professors import Professor
@@ -68,6 +69,16 @@ class Pipeline(_Pipeline):
     tokenizer: transformers.BertTokenizer
     professor: Professor
     text_splitter: Callable[[str], List[str]] = None
+    predictor: CompiledPredictor = None
+    max_tokens: int = 8192
+    stats: Dict = field(default_factory=lambda: {'tokens': 0, 'padded_tokens': 0})
+
+    @property
+    def padding_ratio(self) -> float:
+        """
+        Şimdiye kadar işlenen batch'lerdeki doldurma tokenlarının oranı.
+        """
+        return utils.padding_ratio(self.stats['tokens'], self.stats['padded_tokens'])
 
     def __call__(self, text: str, aspects: List[str]) -> CompletedTask:
         """
@@ -90,14 +101,104 @@ class Pipeline(_Pipeline):
         task = Task(text, aspects, subtasks)
         return task
 
+    def pipe(
+            self,
+            items: Iterable[Tuple[str, List[str]]],
+            batch_size: int = 32,
+            max_tokens: int = None,
+            buffer_size: int = None
+    ) -> Iterable[CompletedTask]:
+        """
+        Çok sayıda (metin, özellikler) çiftini akış halinde işler ve tamamlanan görevleri girdi sırasıyla döndürür.
+        Farklı dokümanlardan gelen örnekler ortak batch'lerde işlenir; bellekte aynı anda en fazla
+        `buffer_size` örneğe ait görev tutulduğu için girdi boyutundan bağımsız olarak bellek sınırlı kalır.
+
+        Args:
+            items (Iterable[Tuple[str, List[str]]]): (metin, özellikler) çiftleri.
+            batch_size (int): Bir batch'teki en fazla örnek sayısı.
+            max_tokens (int): Bir batch'in en fazla token sayısı. Verilmezse `max_tokens` alanı kullanılır.
+            buffer_size (int): Uzunluğa göre birlikte gruplanacak en fazla örnek sayısı. Verilmezse `8 * batch_size`.
+
+        Returns:
+            Iterable[CompletedTask]: Girdi sırasıyla tamamlanan görevler.
+        """
+        buffer_size = buffer_size or 8 * batch_size
+        tasks, tokenized_tasks, num_examples = [], [], 0
+        for text, aspects in items:
+            task = self.preprocess(text, list(aspects))
+            tasks.append(task)
+            tokenized_tasks.append(self.tokenize(task.examples))
+            num_examples += len(tokenized_tasks[-1])
+            if num_examples >= buffer_size:
+                yield from self.complete(tasks, tokenized_tasks, batch_size, max_tokens)
+                tasks, tokenized_tasks, num_examples = [], [], 0
+        if tasks:
+            yield from self.complete(tasks, tokenized_tasks, batch_size, max_tokens)
+
+    def complete(
+            self,
+            tasks: List[Task],
+            tokenized_tasks: List[List[TokenizedExample]] = None,
+            max_batch_size: int = None,
+            max_tokens: int = None
+    ) -> List[CompletedTask]:
+        """
+        Birden fazla görevin örneklerini ortak batch'lerde işler, ardından sonuçları her göreve geri dağıtır.
+        """
+        if tokenized_tasks is None:
+            tokenized_tasks = [self.tokenize(task.examples) for task in tasks]
+        tokenized_examples = [e for examples in tokenized_tasks for e in examples]
+        predictions = self.transform_tokenized(tokenized_examples, max_batch_size, max_tokens)
+
+        completed_tasks = []
+        start = 0
+        for task, examples in zip(tasks, tokenized_tasks):
+            end = start + len(examples)
+            completed_tasks.append(self.postprocess(task, predictions[start:end]))
+            start = end
+        return completed_tasks
+
     def transform(self, examples: Iterable[Example]) -> Iterable[PredictedExample]:
         """
         Tokenize etme, kodlama ve tahmin adımlarını gerçekleştirir.
         """
         tokenized_examples = self.tokenize(examples)
-        input_batch = self.encode(tokenized_examples)
-        output_batch = self.predict(input_batch)
-        predictions = self.review(tokenized_examples, output_batch)
+        return self.transform_tokenized(tokenized_examples)
+
+    def transform_tokenized(
+            self,
+            examples: List[TokenizedExample],
+            max_batch_size: int = None,
+            max_tokens: int = None
+    ) -> List[PredictedExample]:
+        """
+        Tokenize edilmiş örnekleri alt token uzunluğuna göre sıralayarak `max_tokens` bütçesini aşmayan
+        batch'lerde kodlar ve tahmin eder; tahminler girdi sırasıyla döndürülür.
+
+        Args:
+            examples (List[TokenizedExample]): Tokenize edilmiş örnekler.
+            max_batch_size (int): Bir batch'teki en fazla örnek sayısı.
+            max_tokens (int): Bir batch'in en fazla token sayısı. Verilmezse `max_tokens` alanı kullanılır.
+
+        Returns:
+            List[PredictedExample]: Girdi sırasıyla tahminler.
+        """
+        lengths = [len(e.subtokens) for e in examples]
+        predictions = [None] * len(examples)
+        num_tokens, num_padded_tokens = 0, 0
+        for indices in utils.token_budget_batches(lengths, max_tokens or self.max_tokens, max_batch_size):
+            batch = [examples[i] for i in indices]
+            input_batch = self.encode(batch)
+            output_batch = self.predict(input_batch)
+            for i, prediction in zip(indices, self.review(batch, output_batch)):
+                predictions[i] = prediction
+            num_tokens += sum(lengths[i] for i in indices)
+            num_padded_tokens += int(tf.size(input_batch.token_ids))
+
+        self.stats['tokens'] += num_tokens
+        self.stats['padded_tokens'] += num_padded_tokens
+        if examples:
+            logger.debug(f'{len(examples)} örnek, doldurma oranı: {utils.padding_ratio(num_tokens, num_padded_tokens):.2%}')
         return predictions
 
     def tokenize(self, examples: Iterable[Example]) -> List[TokenizedExample]:
@@ -128,34 +229,99 @@ class Pipeline(_Pipeline):
 
     def predict(self, input_batch: InputBatch) -> OutputBatch:
         """
-        Kodlanmış girdilerle modelden tahminler yapar.
+        Kodlanmış girdilerle modelden tahminler yapar. Yalnızca Professor'un tanıyıcılarının
+        ihtiyaç duyduğu çıktılar hesaplanır: açıklama gerekmiyorsa yalın çıkarım yolu kullanılır,
+        gradyanlar yalnızca istendiğinde hesaplanır ve dikkat × |gradyan| çarpımı katman katman
+        toplanarak tüm katmanlar yığılmadan indirgenir.
         """
-        with tf.GradientTape() as tape:
+        requirements = self.professor.requirements
+        if not requirements.needs_details:
+            return self.predict_scores(input_batch)
+
+        needs_gradients = requirements.needs_gradients
+        # Gradyan gerekmiyorsa değişkenler izlenmez ve bant hiçbir işlemi kaydetmez
+        with tf.GradientTape(watch_accessed_variables=needs_gradients) as tape:
             logits, hidden_states, attentions = self.model.call(
                 input_ids=input_batch.token_ids,
                 attention_mask=input_batch.attention_mask,
-                token_type_ids=input_batch.token_type_ids
+                token_type_ids=input_batch.token_type_ids,
+                output_attentions=needs_gradients or requirements.attentions,
+                output_hidden_states=requirements.needs_hidden_states
             )
 
             predictions = tf.argmax(logits, axis=-1)
             labels = tf.one_hot(predictions, depth=3)
             loss_value = classifier_loss(labels, logits)
-        attention_grads = tape.gradient(loss_value, attentions)
 
         scores = tf.nn.softmax(logits, axis=1)
 
         stack = lambda x, order: tf.transpose(tf.stack(x), order)
-        hidden_states = stack(hidden_states, [1, 0, 2, 3])
-        attentions = stack(attentions, [1, 0, 2, 3, 4])
-        attention_grads = stack(attention_grads, [1, 0, 2, 3, 4])
-        output_batch = OutputBatch(
-            scores=scores,
-            hidden_states=hidden_states,
-            attentions=attentions,
-            attention_grads=attention_grads
-        )
+        details = {}
+        if requirements.needs_hidden_states:
+            layers = requirements.hidden_layers
+            selected = hidden_states
+            if layers is not None:
+                # Katman numaraları korunur (`hidden_states[:, k]` k. katmandır); istenmeyen katmanlar sıfırlanır
+                # ve istenen en büyük katmandan sonraki katmanlar çıktıya eklenmez
+                selected = [
+                    hidden_states[i] if i in layers else tf.zeros_like(hidden_states[i])
+                    for i in range(max(layers) + 1)
+                ]
+            details['hidden_states'] = stack(selected, [1, 0, 2, 3])
+        if requirements.attentions:
+            details['attentions'] = stack(attentions, [1, 0, 2, 3, 4])
+
+        if needs_gradients:
+            # Tüm dikkat gradyanları tek bir geri yayılımla hesaplanır
+            attention_grads = tape.gradient(loss_value, attentions)
+            if requirements.attention_grads:
+                details['attention_grads'] = stack(attention_grads, [1, 0, 2, 3, 4])
+            if requirements.attention_products:
+                # Her katmanın katkısı kafalar üzerinden toplanarak [B, T, T] boyutunda biriktirilir;
+                # katmanların çarpımları ayrı ayrı tutulup yığılmaz
+                attention_products = tf.zeros_like(attentions[0][:, 0])
+                for attention, grad in zip(attentions, attention_grads):
+                    attention_products += tf.reduce_sum(attention * tf.abs(grad), axis=1)
+                details['attention_products'] = attention_products
+        output_batch = OutputBatch(scores=scores, **details)
         return output_batch
 
+    def predict_scores(self, input_batch: InputBatch) -> OutputBatch:
+        """
+        Gradyan kaydı ve geri yayılım olmadan, dikkat ve gizli durum çıktıları istenmeden
+        yalnızca skorları hesaplar. `compile` çağrıldıysa derlenmiş fonksiyon kullanılır.
+        """
+        if self.predictor is not None:
+            return OutputBatch(scores=self.predictor(input_batch))
+
+        logits, _, _ = self.model.call(
+            input_ids=input_batch.token_ids,
+            attention_mask=input_batch.attention_mask,
+            token_type_ids=input_batch.token_type_ids,
+            output_attentions=False,
+            output_hidden_states=False
+        )
+        scores = tf.nn.softmax(logits, axis=1)
+        return OutputBatch(scores=scores)
+
+    def compile(self, jit_compile: bool = False, warm_up: bool = True, **predictor_kwargs) -> CompiledPredictor:
+        """
+        Yalın çıkarım yolunu `tf.function` ile (isteğe bağlı olarak XLA ile) derler. Derlenmiş fonksiyon
+        yalnızca Professor açıklama gerektirmediğinde kullanılır.
+
+        Args:
+            jit_compile (bool): XLA ile derle.
+            warm_up (bool): Yaygın kova şekillerini önceden derle.
+            **predictor_kwargs: `CompiledPredictor` için kova ayarları.
+
+        Returns:
+            CompiledPredictor: Derlenmiş tahmin fonksiyonu.
+        """
+        self.predictor = CompiledPredictor(self.model, jit_compile, **predictor_kwargs)
+        if warm_up:
+            self.predictor.warm_up()
+        return self.predictor
+
     def review(self, examples: Iterable[TokenizedExample], output_batch: OutputBatch) -> Iterable[PredictedExample]:
         """
         Tahminleri gözden geçirir ve etiketler.
@@ -189,13 +355,15 @@ class Pipeline(_Pipeline):
 
     def evaluate(self, examples: Iterable[LabeledExample], metric: tf.metrics.Metric, batch_size: int) -> tf.Tensor:
         """
-        Modeli değerlendirir.
+        Modeli değerlendirir. Örnekler `8 * batch_size` boyutunda parçalar halinde okunur ve her parça
+        içinde uzunluklarına göre gruplanır; böylece veri kümesinin tamamı belleğe alınmaz.
+        Doldurma oranı `padding_ratio` ile izlenebilir.
         """
-        batches = utils.batches(examples, batch_size)
-        for batch in batches:
-            predictions = self.transform(batch)
+        for chunk in utils.batches(examples, 8 * batch_size):
+            # batch_size bir batch'teki en fazla örnek sayısıdır
+            predictions = self.transform_tokenized(self.tokenize(chunk), max_batch_size=batch_size)
             y_pred = [e.sentiment.value for e in predictions]
-            y_true = [e.sentiment.value for e in batch]
+            y_true = [e.sentiment.value for e in chunk]
             metric.update_state(y_true, y_pred)
         result = metric.result()
         return result
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 import numpy as np
 
 from .aux_models import ReferenceRecognizer, PatternRecognizer
-from .data_types import TokenizedExample, PredictedExample, Output, Review, Sentiment
+from .data_types import TokenizedExample, PredictedExample, Output, OutputRequirements, Review, Sentiment
 
 @dataclass
 class _Professor(ABC):
@@ -28,6 +28,17 @@ class Professor(_Professor):
     reference_recognizer: ReferenceRecognizer = None
     pattern_recognizer: PatternRecognizer = None
 
+    @property
+    def requirements(self) -> OutputRequirements:
+        """
+        Tanıyıcıların ihtiyaç duyduğu model çıktılarının birleşimi. Tanıyıcı yoksa yalnızca skorlar kullanılır.
+        """
+        requirements = OutputRequirements()
+        for recognizer in (self.reference_recognizer, self.pattern_recognizer):
+            if recognizer is not None:
+                requirements |= recognizer.requirements
+        return requirements
+
     def review(self, example: TokenizedExample, output: Output) -> PredictedExample:
         """
         Model çıktısını (Output) kullanarak verilen örnek üzerinde (TokenizedExample) inceleme yapar.
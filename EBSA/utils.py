@@ -1,7 +1,7 @@
 import os
 import pickle
 import logging
-from typing import Any, Iterable, List
+from typing import Any, Iterable, List, Sequence
 from google.cloud import storage
 
 logger = logging.getLogger('absa.utils')
@@ -52,6 +52,44 @@ def batches(examples: Iterable[Any], batch_size: int, reminder: bool = True) ->
     if batch and reminder:
         yield batch
 
+def token_budget_batches(lengths: Sequence[int], max_tokens: int, max_batch_size: int = None) -> Iterable[List[int]]:
+    """
+    Örnekleri uzunluklarına göre sıralayıp, doldurma dahil token sayısı bütçeyi aşmayacak şekilde
+    batch'lere ayırır. Benzer uzunluktaki örnekler aynı batch'e düştüğü için doldurma azalır.
+    
+    Args:
+        lengths (Sequence[int]): Her örneğin token sayısı.
+        max_tokens (int): Bir batch'in en fazla token sayısı (örnek sayısı × en uzun örnek).
+            Bütçeden uzun tek bir örnek kendi batch'inde işlenir.
+        max_batch_size (int): Bir batch'teki en fazla örnek sayısı.
+    
+    Returns:
+        Iterable[List[int]]: Her batch için örneklerin orijinal indeksleri.
+    """
+    batch = []
+    for i in sorted(range(len(lengths)), key=lambda i: lengths[i]):
+        # Sıralı olduğundan batch'in en uzun örneği her zaman son eklenendir
+        full = max_batch_size is not None and len(batch) >= max_batch_size
+        if batch and (full or (len(batch) + 1) * lengths[i] > max_tokens):
+            yield batch
+            batch = []
+        batch.append(i)
+    if batch:
+        yield batch
+
+def padding_ratio(num_tokens: int, num_padded_tokens: int) -> float:
+    """
+    Batch'lerdeki doldurma tokenlarının oranını hesaplar.
+    
+    Args:
+        num_tokens (int): Gerçek token sayısı.
+        num_padded_tokens (int): Doldurma dahil toplam token sayısı.
+    
+    Returns:
+        float: 0 ile 1 arasında doldurma oranı.
+    """
+    return 1 - num_tokens / num_padded_tokens if num_padded_tokens else 0.0
+
 def download_from_bucket(bucket_name: str, remote_path: str, local_path: str):
     """
     Belirtilen bucket'tan bir dosyayı indirir.
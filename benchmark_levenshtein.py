@@ -0,0 +1,85 @@
+import argparse
+import random
+import time
+
+from utils_ner import FuzzyWindowIndex, create_distance_list, edit_distance, find_closest_word, levenshtein_distance
+
+def closest_word_reference(word, sentence_words):
+    """
+    `find_closest_word` fonksiyonunun önceki hali: her aday için erken çıkış olmadan tam DP hesaplanır.
+    """
+    closest_word = None
+    min_distance = float('inf')
+    for sentence_word in sentence_words:
+        distance = levenshtein_distance(word, sentence_word)
+        if distance < min_distance:
+            min_distance = distance
+            closest_word = sentence_word
+    return closest_word
+
+def random_post(vocabulary, length):
+    """
+    Kelime listesinden rastgele kelimelerle uzun bir gönderi oluşturur.
+    """
+    return [random.choice(vocabulary) for _ in range(length)]
+
+def measure(fn, cases, repeat):
+    """
+    Fonksiyonun tüm örnekler üzerindeki ortalama süresini milisaniye cinsinden ölçer.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [fn(word, windows) for word, windows in cases]
+    return (time.perf_counter() - start) / repeat * 1000, results
+
+def main():
+    """
+    Eski Levenshtein döngüsünü bit-paralel ve sınırlı mesafe hesaplamasıyla ve q-gram indeksiyle karşılaştırır.
+    """
+    parser = argparse.ArgumentParser(description="En yakın kelime aramasının hız karşılaştırması")
+    parser.add_argument("--words", type=int, default=300, help="Gönderideki kelime sayısı")
+    parser.add_argument("--entities", type=int, default=20, help="Aranacak varlık sayısı")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    vocabulary = ["bugün", "yine", "müşteri", "hizmetleri", "çok", "kötü", "harika", "internet", "paketi", "fatura",
+                  "uygulama", "kampanya", "şube", "kart", "kredi", "çekmiyor", "aradım", "kimse", "açmadı", "param",
+                  "iade", "edilmedi", "teşekkürler", "hızlı", "çözüm", "buldular", "bekliyorum", "saattir", "bir",
+                  "ve", "ama", "hiç", "değil", "gibi", "daha", "sonra", "önce", "şikayet", "memnunum", "rezalet"]
+    brands = ["Turkcell'in", "Garanti Bankası'ndan", "Türk Hava Yolları", "Vodafone'a", "Yapı Kredi", "Trendyol'dan"]
+    words = random_post(vocabulary, args.words)
+    for _ in range(max(1, args.words // 50)):
+        position = random.randrange(len(words))
+        words[position:position] = random.choice(brands).split(" ")
+
+    # Varlıklar metindeki marka adlarının ek almamış ve Türkçe karaktersiz çevirileri gibidir
+    cases = []
+    for _ in range(args.entities):
+        entity = random.choice(brands).split("'")[0].replace("ı", "i").replace("ü", "u")
+        count = len(entity.split(" "))
+        cases.append((entity, create_distance_list(words, count)))
+
+    reference_ms, reference = measure(closest_word_reference, cases, args.repeat)
+    bounded_ms, bounded = measure(find_closest_word, cases, args.repeat)
+
+    # İndeks her tekrarda yeniden oluşturulur; `change_tr_ner` içinde olduğu gibi metin başına bir kez
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        index = FuzzyWindowIndex(words)
+        indexed = [index.closest(word) for word, _ in cases]
+    indexed_ms = (time.perf_counter() - start) / args.repeat * 1000
+
+    distances = [edit_distance(w, r) for (w, _), r in zip(cases, reference)]
+    assert distances == [edit_distance(w, b) for (w, _), b in zip(cases, bounded)], "Sonuçlar farklı"
+    assert distances == [edit_distance(w, i) for (w, _), i in zip(cases, indexed)], "Sonuçlar farklı"
+
+    print(f"{args.words} kelime, {args.entities} varlık")
+    print(f"{'yöntem':>14} {'ms':>10}")
+    print(f"{'dp':>14} {reference_ms:>10.2f}")
+    print(f"{'bit-paralel':>14} {bounded_ms:>10.2f}  ({reference_ms / bounded_ms:.1f}x)")
+    print(f"{'q-gram indeks':>14} {indexed_ms:>10.2f}  ({reference_ms / indexed_ms:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import csv
+import time
+
+from ner import NER_MODES, extract_orgs, load_models, mode_models
+
+def load_corpus(path, column="raw_text", limit=None):
+    """
+    Örnek metinleri CSV dosyasından okur.
+
+    Args:
+        path (str): CSV dosyasının yolu.
+        column (str): Metinlerin bulunduğu sütun.
+        limit (int): Okunacak en fazla metin sayısı.
+
+    Returns:
+        list: Metinlerin listesi.
+    """
+    with open(path, encoding="utf-8") as file:
+        texts = [row[column] for row in csv.DictReader(file)]
+    return texts[:limit] if limit else texts
+
+def run_mode(texts, mode, profile):
+    """
+    Bir topluluk modunu ve profili metinler üzerinde çalıştırır ve süresini ölçer.
+
+    Returns:
+        tuple: (metin başına milisaniye, her metin için ORG kümeleri)
+    """
+    # Model yükleme süresi ölçüme dahil edilmez
+    load_models(mode_models(mode), profile)
+    start = time.perf_counter()
+    orgs = [extract_orgs([text], mode, profile)[0] for text in texts]
+    elapsed = time.perf_counter() - start
+    return elapsed / len(texts) * 1000, orgs
+
+def recall(predicted, reference):
+    """
+    Referans ORG'ların tahminlerde bulunma oranını hesaplar.
+    """
+    total = sum(len(orgs) for orgs in reference)
+    found = sum(len(p & r) for p, r in zip(predicted, reference))
+    return found / total if total else 1.0
+
+def main():
+    """
+    Her NER topluluk modunun gecikmesini ve tam hatla iki model birlikte çalıştırıldığında
+    bulunan ORG'lara göre duyarlılığını (recall) raporlar.
+    """
+    parser = argparse.ArgumentParser(description="NER modlarının gecikme ve duyarlılık karşılaştırması")
+    parser.add_argument("--corpus", default="Dataset/SemEval14/Test/Laptops_Test.csv")
+    parser.add_argument("--column", default="raw_text")
+    parser.add_argument("--limit", type=int, default=500)
+    args = parser.parse_args()
+
+    texts = load_corpus(args.corpus, args.column, args.limit)
+    reference_ms, reference = run_mode(texts, "both", "full")
+
+    print(f"{len(texts)} metin, referans: both/full ({sum(len(r) for r in reference)} ORG)")
+    print(f"{'mod':>10} {'profil':>8} {'ms/metin':>10} {'duyarlılık':>11}")
+    print(f"{'both':>10} {'full':>8} {reference_ms:>10.2f} {1.0:>11.3f}")
+    for mode in NER_MODES:
+        ms, orgs = run_mode(texts, mode, "ner")
+        print(f"{mode:>10} {'ner':>8} {ms:>10.2f} {recall(orgs, reference):>11.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,10 @@ import subprocess
 import sys
 
 def ensure_en_core_web(model_name):
-    # Modelin yüklenip yüklenmediğini kontrol et
-    try:
-        spacy.load(model_name)
+    # Modelin kurulu olup olmadığını modeli belleğe yüklemeden paket bilgisinden kontrol et
+    if spacy.util.is_package(model_name):
         print(f"{model_name} model çoktan yüklenmiş")
-    except OSError:
+    else:
         print(f"{model_name} model bulunamadı. Yükleniyor...")
         
         # Modeli yüklemek için subprocess kullanarak komut çalıştır
@@ -0,0 +1,131 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+class _Request:
+    """
+    Kuyrukta bekleyen tek bir analiz isteğini temsil eder.
+
+    Özellikler:
+        task (Task): Pipeline tarafından ön işlenmiş görev.
+        examples (list): Göreve ait tokenize edilmiş örnekler.
+        max_length (int): Örneklerdeki en uzun alt token dizisinin uzunluğu.
+        future (Future): Tamamlanan görevin yazılacağı sonuç nesnesi.
+    """
+
+    def __init__(self, task, examples):
+        self.task = task
+        self.examples = examples
+        self.max_length = max((len(e.subtokens) for e in examples), default=0)
+        self.future = Future()
+
+class MicroBatcher:
+    """
+    Eşzamanlı isteklerden gelen (metin parçası, özellik) örneklerini kısa bir bekleme penceresi
+    içinde toplayıp tek bir `Pipeline` kodlama/tahmin adımında çalıştıran zamanlayıcı.
+
+    Özellikler:
+        pipeline (Pipeline): Tahminlerin yapılacağı yüklenmiş ABSA iş hattı.
+        max_wait_ms (float): İlk istek geldikten sonra yeni istekler için beklenecek en uzun süre.
+        max_batch_size (int): Bir batch'te bulunabilecek en fazla örnek sayısı.
+        max_tokens (int): Doldurma (padding) dahil bir batch'in en fazla token sayısı.
+    """
+
+    def __init__(self, pipeline, max_wait_ms=10, max_batch_size=32, max_tokens=8192):
+        self.pipeline = pipeline
+        self.max_wait_ms = max_wait_ms
+        self.max_batch_size = max_batch_size
+        self.max_tokens = max_tokens
+        self._queue = queue.Queue()
+        self._pending = None
+        self._thread = threading.Thread(target=self._run, name="ebsa-micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, text, aspects):
+        """
+        Bir metni ve özelliklerini sıraya ekler. Ön işleme ve tokenizasyon çağıran iş parçacığında yapılır.
+
+        Args:
+            text (str): Analiz edilecek metin.
+            aspects (list): Metindeki özelliklerin listesi.
+
+        Returns:
+            Future: Tamamlandığında `CompletedTask` döndüren sonuç nesnesi.
+        """
+        task = self.pipeline.preprocess(text, list(aspects))
+        request = _Request(task, self.pipeline.tokenize(task.examples))
+        if not request.examples:
+            # Tahmin edilecek örnek yoksa kuyruğa girmeden tamamla
+            request.future.set_result(self.pipeline.postprocess(task, []))
+        else:
+            self._queue.put(request)
+        return request.future
+
+    def __call__(self, text, aspects):
+        """
+        `Pipeline.__call__` ile aynı arayüzü sunar ve sonuç hazır olana kadar bekler.
+        """
+        return self.submit(text, aspects).result()
+
+    def close(self):
+        """
+        Zamanlayıcıyı durdurur. Kuyrukta bekleyen istekler işlendikten sonra iş parçacığı sonlanır.
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+    def _fits(self, batch, request):
+        """
+        İsteğin mevcut batch'e örnek ve token bütçesi aşılmadan eklenip eklenemeyeceğini kontrol eder.
+        """
+        num_examples = sum(len(r.examples) for r in batch) + len(request.examples)
+        max_length = max([r.max_length for r in batch] + [request.max_length])
+        return num_examples <= self.max_batch_size and num_examples * max_length <= self.max_tokens
+
+    def _collect(self, first):
+        """
+        İlk istekten başlayarak bekleme penceresi ve bütçeler dahilinde bir batch toplar.
+        Bütçeye sığmayan istek bir sonraki batch için saklanır.
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                self._queue.put(None)
+                break
+            if not self._fits(batch, request):
+                self._pending = request
+                break
+            batch.append(request)
+        return batch
+
+    def _run(self):
+        """
+        Kuyruğu tüketen arka plan döngüsü.
+        """
+        while True:
+            first, self._pending = self._pending, None
+            if first is None:
+                first = self._queue.get()
+            if first is None:
+                break
+            batch = self._collect(first)
+            try:
+                completed_tasks = self.pipeline.complete(
+                    [r.task for r in batch],
+                    [r.examples for r in batch]
+                )
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            for request, completed_task in zip(batch, completed_tasks):
+                request.future.set_result(completed_task)
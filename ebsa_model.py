@@ -1,27 +1,178 @@
+import threading
+import time
+
 import EBSA as absa
+from ebsa_batcher import MicroBatcher
+
+# Süreç genelinde yüklenmiş Pipeline nesnelerini tutan kayıt defteri
+_pipelines = {}
+_load_times = {}
+_registry_lock = threading.Lock()
+
+# Etkinleştirildiğinde istekler arası batch oluşturan zamanlayıcı
+_batcher = None
+
+def _registry_key(name, load_kwargs):
+    """
+    Model adı ve yükleme argümanlarından kayıt defteri anahtarı oluşturur.
+    Argümanlar hashlenebilir olmak zorunda olmadığı için repr değerleri kullanılır.
+
+    Args:
+        name (str): Yüklenecek modelin adı.
+        load_kwargs (dict): `absa.load` fonksiyonuna iletilen argümanlar.
+
+    Returns:
+        tuple: Kayıt defteri anahtarı.
+    """
+    return (name, tuple(sorted((key, repr(value)) for key, value in load_kwargs.items())))
+
+def get_pipeline(name='absa/classifier-rest-0.2', **load_kwargs):
+    """
+    İstenen modeli süreç başına yalnızca bir kez yükler ve daha önce yüklenmiş örneği döndürür.
+
+    Args:
+        name (str): Yüklenecek modelin adı.
+        **load_kwargs: `absa.load` fonksiyonuna iletilecek ek argümanlar.
+
+    Returns:
+        Pipeline: Yüklenmiş ve kullanıma hazır Pipeline nesnesi.
+    """
+    key = _registry_key(name, load_kwargs)
+    nlp = _pipelines.get(key)
+    if nlp is not None:
+        return nlp
+
+    with _registry_lock:
+        # Kilidi beklerken başka bir iş parçacığı modeli yüklemiş olabilir
+        nlp = _pipelines.get(key)
+        if nlp is None:
+            start = time.perf_counter()
+            nlp = absa.load(name, **load_kwargs)
+            _load_times[key] = time.perf_counter() - start
+            _pipelines[key] = nlp
+            print(f"{name} modeli {_load_times[key]:.2f} saniyede yüklendi")
+    return nlp
+
+def warm_up(name='absa/classifier-rest-0.2', **load_kwargs):
+    """
+    Uygulama başlangıcında modeli önceden yükler ve yükleme süresini raporlar.
+
+    Args:
+        name (str): Yüklenecek modelin adı.
+        **load_kwargs: `absa.load` fonksiyonuna iletilecek ek argümanlar.
+
+    Returns:
+        float: Modelin yüklenme süresi (saniye). Model zaten yüklüyse ilk yüklemenin süresi döner.
+    """
+    get_pipeline(name, **load_kwargs)
+    return _load_times[_registry_key(name, load_kwargs)]
+
+def loaded_models():
+    """
+    Kayıt defterindeki modelleri ve yüklenme sürelerini döndürür.
+
+    Returns:
+        dict: Model adı ve argümanlarından oluşan anahtarlar ile yüklenme süreleri (saniye).
+    """
+    return dict(_load_times)
+
+def enable_compilation(jit_compile=False, name='absa/classifier-rest-0.2', **load_kwargs):
+    """
+    Modelin yalın çıkarım yolunu `tf.function` (isteğe bağlı olarak XLA) ile derler ve yaygın
+    girdi şekillerini önceden derleyerek ilk isteklerin derleme beklemesini önler.
+
+    Args:
+        jit_compile (bool): XLA ile derle.
+        name (str): Kullanılacak modelin adı.
+        **load_kwargs: `absa.load` fonksiyonuna iletilecek ek argümanlar.
+
+    Returns:
+        float: Ön derleme süresi (saniye).
+    """
+    start = time.perf_counter()
+    get_pipeline(name, **load_kwargs).compile(jit_compile=jit_compile)
+    return time.perf_counter() - start
+
+def compilation_stats(name='absa/classifier-rest-0.2', **load_kwargs):
+    """
+    Derlenmiş tahmin fonksiyonunun derleme, çağrı ve kova isabet sayılarını döndürür.
+
+    Returns:
+        dict: İstatistikler veya model derlenmemişse boş sözlük.
+    """
+    predictor = get_pipeline(name, **load_kwargs).predictor
+    return predictor.stats if predictor is not None else {}
+
+def enable_micro_batching(max_wait_ms=10, max_batch_size=32, max_tokens=8192, name='absa/classifier-rest-0.2', **load_kwargs):
+    """
+    Eşzamanlı `ebsa_sentiment` çağrılarını tek bir model geçişinde birleştiren zamanlayıcıyı başlatır.
+
+    Args:
+        max_wait_ms (float): Bir batch'i doldurmak için beklenecek en uzun süre (milisaniye).
+        max_batch_size (int): Bir batch'teki en fazla örnek sayısı.
+        max_tokens (int): Doldurma dahil bir batch'in en fazla token sayısı.
+        name (str): Kullanılacak modelin adı.
+        **load_kwargs: `absa.load` fonksiyonuna iletilecek ek argümanlar.
+
+    Returns:
+        MicroBatcher: Başlatılan zamanlayıcı.
+    """
+    global _batcher
+    disable_micro_batching()
+    _batcher = MicroBatcher(get_pipeline(name, **load_kwargs), max_wait_ms, max_batch_size, max_tokens)
+    return _batcher
+
+def disable_micro_batching():
+    """
+    Çalışan zamanlayıcıyı durdurur; sonraki çağrılar doğrudan Pipeline üzerinden yapılır.
+    """
+    global _batcher
+    batcher, _batcher = _batcher, None
+    if batcher is not None:
+        batcher.close()
 
 def ebsa_sentiment(aspects, text):
     """
     Belirli bir metin ve yöneltilen özellikler (aspects) için ABSA (Aspect-Based Sentiment Analysis) modelini kullanarak duygu analizi yapar.
-    
+
     Args:
         aspects (list): Metinde analiz edilmesi gereken özelliklerin (aspects) listesi. Her özellik, duygu analizinin yapılacağı bir yön veya konu olabilir.
         text (str): Analiz edilecek metin.
-        
+
     Returns:
         list: ABSA modelinin analiz sonuçlarını içeren bir liste. Her bir öğe, metindeki bir özelliğe ilişkin duygu skorlarını içerir.
         dict: Hata durumunda boş bir sözlük döner.
     """
     try:
-        # ABSA modelini yükle
-        nlp = absa.load()
-        
+        # Zamanlayıcı etkinse isteği diğer isteklerle aynı batch'te çalıştır,
+        # değilse süreç genelinde önceden yüklenmiş ABSA modelini kullan
+        nlp = _batcher or get_pipeline()
+
         # Metni ve özellikleri kullanarak duygu analizini yap
-        sentiments = nlp(text, aspects=aspects)
-        
+        sentiments = nlp(text, aspects)
+
         return sentiments
-    
+
     except Exception as e:
         # Hata durumunda boş bir sözlük döndür
         print(f"Hata: {e}")  # Hata mesajını ekrana yazdır
         return {}
+
+def ebsa_sentiment_batch(items):
+    """
+    Birden fazla (özellikler, metin) çifti için duygu analizini `Pipeline.pipe` ile, örnekleri metinler arası ortak batch'lerde işleyerek yapar.
+
+    Args:
+        items (list): `(aspects, text)` çiftlerinin listesi.
+
+    Returns:
+        list: Her çift için `ebsa_sentiment` ile aynı biçimde sonuç. Hata durumunda her öğe için boş bir sözlük döner.
+    """
+    items = list(items)
+    try:
+        # Farklı metinlerin örnekleri ortak batch'lerde işlenir
+        return list(get_pipeline().pipe((text, aspects) for aspects, text in items))
+
+    except Exception as e:
+        print(f"Hata: {e}")
+        return [{} for _ in items]
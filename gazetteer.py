@@ -0,0 +1,226 @@
+import json
+import os
+
+# Türkçe karakterleri ASCII karşılıklarına indirger; dönüşüm karakter sayısını korur
+_NORMALIZATION = str.maketrans("çğıöşüÇĞİIÖŞÜâîû", "cgiosucgiiosuaiu")
+
+# Özel isimlere kesme işareti olmadan da eklenebilen yaygın Türkçe ekler (normalize edilmiş)
+TURKISH_SUFFIXES = {
+    "a", "e", "i", "u", "ya", "ye", "yi", "yu", "na", "ne", "ni", "nu",
+    "da", "de", "ta", "te", "nda", "nde", "dan", "den", "tan", "ten", "ndan", "nden",
+    "in", "un", "nin", "nun", "la", "le", "yla", "yle", "ca", "ce", "ci", "cu",
+    "lar", "ler", "lari", "leri", "larin", "lerin", "daki", "deki", "taki", "teki", "ndaki", "ndeki",
+    # İyelik eki ve ardından gelen hal ekleri ("Garantisi", "Turkcellinin", "THY'sinden")
+    "si", "su", "sini", "sunu", "sinin", "sunun", "sina", "sine", "suna",
+    "sinda", "sinde", "sunda", "sindan", "sinden", "sundan", "siyla", "siyle", "suyla",
+    "ini", "unu", "inin", "unun", "ina", "ine", "una",
+    "inda", "inde", "unda", "indan", "inden", "undan", "iyla", "iyle", "uyla",
+}
+APOSTROPHES = "'’`"
+
+def normalize(text):
+    """
+    Metni küçük harfe ve Türkçe karakterleri ASCII karşılıklarına çevirir. Karakter indeksleri korunur.
+
+    Args:
+        text (str): Normalleştirilecek metin.
+
+    Returns:
+        str: Aynı uzunlukta normalleştirilmiş metin.
+    """
+    return text.translate(_NORMALIZATION).lower()
+
+class GazetteerEntry:
+    """
+    Sözlükteki bir varlık.
+
+    Özellikler:
+        name (str): Varlığın kanonik adı (ör. "Türk Hava Yolları").
+        aspect (str): Duygu analizinde kullanılacak İngilizce ad (ör. "Turkish Airlines").
+        aliases (list): Varlığın metinde geçebileceği diğer adlar.
+    """
+
+    def __init__(self, name, aspect=None, aliases=()):
+        self.name = name
+        self.aspect = aspect or name
+        self.aliases = list(dict.fromkeys([name, self.aspect] + list(aliases)))
+
+class GazetteerMatch:
+    """
+    Metinde bulunan bir sözlük eşleşmesi.
+
+    Özellikler:
+        entry (GazetteerEntry): Eşleşen varlık.
+        alias (str): Eşleşen ad.
+        start (int): Eşleşmenin orijinal metindeki başlangıç indeksi.
+        end (int): Eşleşmenin (ek hariç) bitiş indeksi.
+        surface (str): Orijinal metindeki eşleşen ifade.
+        confident (bool): Kısa adların büyük/küçük harf uyumu gibi kontrollerden geçip geçmediği.
+    """
+
+    def __init__(self, entry, alias, start, end, surface, confident):
+        self.entry = entry
+        self.alias = alias
+        self.start = start
+        self.end = end
+        self.surface = surface
+        self.confident = confident
+
+class Gazetteer:
+    """
+    Bilinen varlık adlarını ve takma adlarını Aho-Corasick otomatına derleyerek orijinal metin üzerinde
+    tek geçişte arar. Türkçe ekli kullanımlar ("Turkcell'in", "thyden") de tanınır.
+
+    Özellikler:
+        entries (list): Sözlükteki varlıklar.
+        min_confident_length (int): Bu uzunluktan kısa adlar yalnızca yazımı birebir uyuşursa güvenilir sayılır.
+    """
+
+    def __init__(self, entries, min_confident_length=4):
+        self.entries = list(entries)
+        self.min_confident_length = min_confident_length
+        self._aliases = {}
+        for entry in self.entries:
+            for alias in entry.aliases:
+                self._aliases.setdefault(normalize(alias), (entry, alias))
+        self._build()
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """
+        Sözlüğü JSON dosyasından yükler. Dosya bir ad listesi ya da
+        {"name", "aspect", "aliases"} alanlarını içeren nesnelerin listesi olabilir.
+
+        Args:
+            path (str): JSON dosyasının yolu.
+
+        Returns:
+            Gazetteer: Derlenmiş sözlük.
+        """
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        entries = [GazetteerEntry(item) if isinstance(item, str) else GazetteerEntry(**item) for item in data]
+        return cls(entries, **kwargs)
+
+    def _build(self):
+        """
+        Normalleştirilmiş adlardan Aho-Corasick otomatını (geçiş, hata bağlantıları ve çıktılar) oluşturur.
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for key in self._aliases:
+            state = 0
+            for char in key:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].append(key)
+
+        # Hata bağlantılarını genişlik öncelikli olarak hesapla
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def _suffix_end(self, normalized, end):
+        """
+        Eşleşmenin ardından gelen ekin geçerli olup olmadığını kontrol eder.
+
+        Returns:
+            int: Ek dahil kelimenin bitiş indeksi veya ek geçersizse -1.
+        """
+        n = len(normalized)
+        if end == n or not normalized[end].isalnum() and normalized[end] not in APOSTROPHES:
+            return end
+        start = end + 1 if normalized[end] in APOSTROPHES else end
+        word_end = start
+        while word_end < n and normalized[word_end].isalnum():
+            word_end += 1
+        suffix = normalized[start:word_end]
+        if normalized[end] in APOSTROPHES and suffix.isalpha():
+            return word_end
+        return word_end if suffix in TURKISH_SUFFIXES else -1
+
+    def find(self, text):
+        """
+        Metindeki sözlük varlıklarını bulur. Çakışan eşleşmelerde en soldaki ve en uzun olan seçilir.
+
+        Args:
+            text (str): Orijinal (çevrilmemiş) metin.
+
+        Returns:
+            list: Metindeki sırasıyla `GazetteerMatch` nesneleri.
+        """
+        normalized = normalize(text)
+        candidates = []
+        state = 0
+        for i, char in enumerate(normalized):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for key in self._output[state]:
+                start, end = i + 1 - len(key), i + 1
+                if start > 0 and normalized[start - 1].isalnum():
+                    continue
+                if self._suffix_end(normalized, end) == -1:
+                    continue
+                candidates.append((start, end, key))
+
+        matches = []
+        last_end = 0
+        for start, end, key in sorted(candidates, key=lambda c: (c[0], -(c[1] - c[0]))):
+            if start < last_end:
+                continue
+            entry, alias = self._aliases[key]
+            surface = text[start:end]
+            confident = len(key) >= self.min_confident_length or surface == alias
+            matches.append(GazetteerMatch(entry, alias, start, end, surface, confident))
+            last_end = end
+        return matches
+
+    def lookup(self, name):
+        """
+        Bir adın sözlükteki varlığını döndürür (ör. model tarafından bulunan bir ORG için).
+
+        Args:
+            name (str): Aranacak ad.
+
+        Returns:
+            GazetteerEntry: Eşleşen varlık veya bulunamazsa None.
+        """
+        found = self._aliases.get(normalize(name.strip()))
+        return found[0] if found else None
+
+_gazetteer = None
+
+def get_gazetteer():
+    """
+    NYMAI_GAZETTEER ortam değişkeninde belirtilen sözlüğü ilk çağrıda yükler ve sonraki çağrılarda aynı nesneyi döndürür.
+
+    Returns:
+        Gazetteer: Yüklenmiş sözlük veya yapılandırılmamışsa None.
+    """
+    global _gazetteer
+    path = os.environ.get("NYMAI_GAZETTEER")
+    if _gazetteer is None and path:
+        _gazetteer = Gazetteer.from_file(path)
+    return _gazetteer
+
+def set_gazetteer(gazetteer):
+    """
+    Etkin sözlüğü değiştirir.
+
+    Args:
+        gazetteer (Gazetteer): Kullanılacak sözlük veya devre dışı bırakmak için None.
+    """
+    global _gazetteer
+    _gazetteer = gazetteer
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+class PoolFullError(Exception):
+    """
+    Çalışan havuzu ve bekleme kuyruğu dolu olduğunda fırlatılan istisna.
+    """
+    pass
+
+class ClientDisconnectedError(Exception):
+    """
+    İstemci bağlantıyı kapattığı için bekleyen işin iptal edildiğini belirten istisna.
+    """
+    pass
+
+class InferencePool:
+    """
+    Engelleyici (blocking) model çağrılarını olay döngüsü dışında, sınırlı bir çalışan havuzunda yürütür.
+    Aynı anda kabul edilen iş sayısı `max_workers + max_queue` ile sınırlıdır; sınır aşıldığında
+    iş kuyruğa alınmak yerine hemen reddedilir.
+
+    Özellikler:
+        max_workers (int): Aynı anda çalışan iş parçacığı veya süreç sayısı.
+        max_queue (int): Çalışanları bekleyebilecek en fazla iş sayısı.
+        use_processes (bool): True ise iş parçacıkları yerine süreç havuzu kullanılır.
+    """
+
+    def __init__(self, max_workers=1, max_queue=32, use_processes=False, initializer=None):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.use_processes = use_processes
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self._executor = executor_class(max_workers=max_workers, initializer=initializer)
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+
+    async def run(self, fn, *args, is_disconnected=None, poll_interval=0.1):
+        """
+        Fonksiyonu havuzda çalıştırır ve sonucunu olay döngüsünü engellemeden bekler.
+
+        Args:
+            fn (Callable): Çalıştırılacak fonksiyon. Süreç havuzunda modül seviyesinde tanımlı olmalıdır.
+            *args: Fonksiyona iletilecek argümanlar.
+            is_disconnected (Callable): İstemcinin bağlantısının kopup kopmadığını döndüren asenkron fonksiyon.
+            poll_interval (float): Bağlantı kontrolleri arasındaki süre (saniye).
+
+        Returns:
+            Any: Fonksiyonun döndürdüğü değer.
+
+        Raises:
+            PoolFullError: Havuz ve kuyruk doluysa.
+            ClientDisconnectedError: İstemci sonuç hazır olmadan bağlantıyı kapattıysa.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise PoolFullError(f"Kuyruk dolu ({self.max_workers} çalışan, {self.max_queue} bekleyen iş)")
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        waiter = asyncio.wrap_future(future)
+        while True:
+            done, _ = await asyncio.wait({waiter}, timeout=poll_interval)
+            if done:
+                return waiter.result()
+            if is_disconnected is not None and await is_disconnected():
+                # Henüz başlamamış işler iptal edilir; çalışmakta olan iş tamamlanınca yeri boşalır
+                future.cancel()
+                raise ClientDisconnectedError("İstemci bağlantısı koptu")
+
+    def shutdown(self):
+        """
+        Bekleyen işleri iptal eder ve havuzu kapatır.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,6 +1,7 @@
-from utils_text import translate_to_en, space_handler, clean_text, output_formater
-from ner import special_cases, find_company_names, change_tr_ner
-from ebsa_model import ebsa_sentiment
+from utils_text import translate_to_en_aligned, translate_batch_to_en_aligned, space_handler, clean_text, output_formater
+from ner import NlpDocument, special_cases, find_company_names, find_company_names_batch, change_tr_ner, gazetteer_matches, GAZETTEER_SKIP_NER
+from gazetteer import get_gazetteer
+from ebsa_model import ebsa_sentiment, ebsa_sentiment_batch
 
 class MainModel:
     """
@@ -9,6 +10,8 @@ class MainModel:
     Özellikler:
         company_set (set): Metinden çıkarılan ve işlenen şirket adlarını tutan küme.
         output (dict): Duygu analizi sonuçlarını ve diğer bilgileri içeren çıktı.
+        spans (dict): Her şirket adının orijinal metindeki (başlangıç, bitiş) karakter aralığı
+            (`execute_batch` sonrasında metin başına bir sözlük içeren liste).
     """
     
     def __init__(self):
@@ -17,8 +20,9 @@ class MainModel:
         """
         self.company_set = set()
         self.output = {}
+        self.spans = {}
 
-    def execute_model(self, text):
+    def execute_model(self, text, alignment=None):
         """
         Verilen metin üzerinde bir dizi işlem gerçekleştirir:
         1. Metni İngilizceye çevirir.
@@ -30,9 +34,12 @@ class MainModel:
         
         Args:
             text (str): İşlenecek metin.
+            alignment (TranslationAlignment): Önceden yapılmış çeviri (ör. `translate_to_en_aligned_async` ile).
+                Verilmezse metin burada çevrilir.
         """
-        # Metni İngilizceye çevir
-        translated_text = translate_to_en(text)
+        # Metni İngilizceye çevir ve cümle eşleşmelerini kaydet
+        alignment = alignment or translate_to_en_aligned(text)
+        translated_text = alignment.target
         
         # Metindeki fazla boşlukları ve özel karakterleri düzenle
         translated_text = space_handler(translated_text)
@@ -40,20 +47,75 @@ class MainModel:
         # Metni temizle
         cleaned_text = clean_text(translated_text)
         
+        # Metin her SpaCy modeli tarafından en fazla bir kez işlenir; tüm aşamalar aynı dokümanı kullanır
+        document = NlpDocument(cleaned_text)
+        
         # Özel durumları işleyerek şirket isimlerini ayıkla
-        special_cases(cleaned_text, self.company_set)
+        special_cases(document, self.company_set)
         
-        # Şirket isimlerini bul ve işleyerek kümesine ekle
-        find_company_names(cleaned_text, self.company_set)
+        # Orijinal metin sözlükte bir kez aranır; NER sonuçları sözlük eşleşmeleriyle birleştirilir
+        gazetteer = get_gazetteer()
+        matches = gazetteer_matches(text, gazetteer)
+        if not (GAZETTEER_SKIP_NER and matches):
+            # Şirket isimlerini bul ve işleyerek kümesine ekle
+            find_company_names(document, self.company_set, gazetteer)
         
-        # Şirket isimlerini Türkçe'den İngilizce'ye çevir ve metindeki en yakın eşleşenleri bul
-        ner_results = change_tr_ner(text, self.company_set)
+        # Şirket isimlerini çeviri eşleşmeleri üzerinden orijinal metne yansıt, bulunamayanları çevirerek ara
+        self.spans = {}
+        ner_results = change_tr_ner(text, self.company_set, alignment, gazetteer, self.spans, matches)
         
         # ABSA modelini kullanarak duygu analizi yap
         sentiments = ebsa_sentiment(ner_results.keys(), translated_text.translate(str.maketrans('', '', '!"#$%&\'()*+,-./:;<=>?[\\]^`{|}~')))
         # Sonuçları formatla ve sakla
         self.output = output_formater(sentiments, ner_results)
 
+    def execute_batch(self, texts, alignments=None):
+        """
+        Metin listesi üzerinde `execute_model` ile aynı işlemleri her aşamayı toplu çalıştırarak gerçekleştirir:
+        metinler tek seferde çevrilir, SpaCy modelleri `nlp.pipe` ile çalıştırılır ve tüm (metin, varlık)
+        çiftleri tek bir ABSA geçişinde analiz edilir.
+        
+        Args:
+            texts (list): İşlenecek metinlerin listesi.
+            alignments (list): Metinlerin önceden yapılmış çevirileri (girdi sırasıyla). Verilmezse metinler burada çevrilir.
+            
+        Returns:
+            list: Her metin için `output_formater` biçiminde bir sözlük (girdi sırasıyla).
+        """
+        texts = list(texts)
+        
+        # Metinleri toplu olarak İngilizceye çevir ve düzenle
+        alignments = alignments or translate_batch_to_en_aligned(texts)
+        translated_texts = [space_handler(a.target) for a in alignments]
+        cleaned_texts = [clean_text(t) for t in translated_texts]
+        
+        # Her metin için ayrı bir şirket kümesi oluştur ve şirket isimlerini toplu olarak ayıkla
+        company_sets = [set() for _ in texts]
+        for cleaned_text, company_set in zip(cleaned_texts, company_sets):
+            special_cases(cleaned_text, company_set)
+        
+        # Metinler sözlükte bir kez aranır; NER sonuçları sözlük eşleşmeleriyle birleştirilir
+        gazetteer = get_gazetteer()
+        matches = [gazetteer_matches(text, gazetteer) for text in texts]
+        indices = [i for i in range(len(texts)) if not (GAZETTEER_SKIP_NER and matches[i])]
+        if indices:
+            find_company_names_batch([cleaned_texts[i] for i in indices], [company_sets[i] for i in indices], gazetteer=gazetteer)
+        
+        # Her metnin şirket aralıkları `spans` listesinde girdi sırasıyla tutulur
+        self.spans = [{} for _ in texts]
+        ner_results = [
+            change_tr_ner(*args)
+            for args in zip(texts, company_sets, alignments, [gazetteer] * len(texts), self.spans, matches)
+        ]
+        
+        # Tüm (metin, varlık) çiftleri için duygu analizini tek geçişte yap
+        sentiments = ebsa_sentiment_batch(
+            (results.keys(), translated_text.translate(str.maketrans('', '', '!"#$%&\'()*+,-./:;<=>?[\\]^`{|}~')))
+            for results, translated_text in zip(ner_results, translated_texts)
+        )
+        self.output = [output_formater(s, results) for s, results in zip(sentiments, ner_results)]
+        return self.output
+
     def take_outputs(self):
         """
         Analiz sonuçlarını döndürür ve ekrana yazdırır.
@@ -1,71 +1,391 @@
+import os
+import threading
+from itertools import islice
 import spacy
-from utils_text import translate_to_tr, translate_to_en,simple_stem
-from utils_ner import create_distance_list, find_closest_word
+from utils_text import translate_batch_to_tr, translate_batch_to_en, simple_stem
+from utils_ner import FuzzyWindowIndex
+from text_alignment import fold_case
 from download_manager import ensure_en_core_web
+from gazetteer import get_gazetteer
 
-# Gerekli dil modellerini indir
-ensure_en_core_web("en_core_web_lg")
-ensure_en_core_web("en_core_web_sm")
+# Şirket isimlerini bulmak için kullanılacak SpaCy modelleri (virgülle ayrılmış)
+SPACY_MODELS = [name.strip() for name in os.environ.get("NYMAI_SPACY_MODELS", "en_core_web_sm,en_core_web_lg").split(",") if name.strip()]
 
-# SpaCy dil modellerini yükle
-nlp_sm = spacy.load("en_core_web_sm")
-nlp_lg = spacy.load("en_core_web_lg")
+# Model çalıştırma profili: "ner" yalnızca ORG çıkarımı için gereken bileşenleri çalıştırır, "full" tüm hattı
+SPACY_PROFILE = os.environ.get("NYMAI_SPACY_PROFILE", "ner")
+
+# Topluluk (ensemble) modu: "sm" yalnızca ilk model, "lg" yalnızca son model, "both" tüm modeller,
+# "fallback" modelleri sırayla dener ve ORG bulunduğunda durur
+NER_MODE = os.environ.get("NYMAI_NER_MODE", "both")
+NER_MODES = ("sm", "lg", "both", "fallback")
+
+# "1" ise sözlük metinde güvenilir bir eşleşme bulduğunda model tabanlı NER atlanır. Sözlükte bulunmayan
+# şirketler bu durumda sonuçlara girmediği için varsayılan olarak kapalıdır; NER sonuçları sözlük eşleşmeleriyle birleştirilir
+GAZETTEER_SKIP_NER = os.environ.get("NYMAI_GAZETTEER_SKIP_NER", "0") == "1"
+
+# Yüklenmiş SpaCy modelleri; modeller ilk kullanıldıklarında yüklenir
+_nlp_models = {}
+_nlp_lock = threading.Lock()
+
+def apply_profile(nlp, profile):
+    """
+    Modeldeki bileşenleri çalıştırma profiline göre devre dışı bırakır. "ner" profilinde yalnızca
+    `ner` ve `ner` bileşeni paylaşılan `tok2vec` katmanını dinliyorsa `tok2vec` çalışır.
+    
+    Args:
+        nlp (spacy.language.Language): Yüklenmiş SpaCy modeli.
+        profile (str): "ner" veya "full".
+    """
+    if profile == "full":
+        return
+    if profile != "ner":
+        raise ValueError(f"Bilinmeyen SpaCy profili: {profile}")
+    keep = {"ner"}
+    if "tok2vec" in nlp.pipe_names and "ner" in getattr(nlp.get_pipe("tok2vec"), "listening_components", []):
+        keep.add("tok2vec")
+    for name in nlp.pipe_names:
+        if name not in keep:
+            nlp.disable_pipe(name)
+
+def get_nlp(name, profile=None):
+    """
+    SpaCy modelini ilk çağrıda indirir (gerekirse) ve yükler, sonraki çağrılarda aynı nesneyi döndürür.
+    
+    Args:
+        name (str): SpaCy model adı.
+        profile (str): Çalıştırma profili ("ner" veya "full"). Verilmezse `SPACY_PROFILE` kullanılır.
+        
+    Returns:
+        spacy.language.Language: Yüklenmiş SpaCy modeli.
+    """
+    key = (name, profile or SPACY_PROFILE)
+    nlp = _nlp_models.get(key)
+    if nlp is None:
+        with _nlp_lock:
+            nlp = _nlp_models.get(key)
+            if nlp is None:
+                ensure_en_core_web(name)
+                nlp = spacy.load(name)
+                apply_profile(nlp, key[1])
+                _nlp_models[key] = nlp
+    return nlp
+
+def mode_models(mode=None):
+    """
+    Topluluk moduna göre kullanılacak model adlarını döndürür.
+    
+    Args:
+        mode (str): "sm", "lg", "both" veya "fallback". Verilmezse `NER_MODE` kullanılır.
+        
+    Returns:
+        list: Sırasıyla çalıştırılacak model adları.
+    """
+    mode = mode or NER_MODE
+    if mode not in NER_MODES:
+        raise ValueError(f"Bilinmeyen NER modu: {mode}")
+    if mode == "sm":
+        return SPACY_MODELS[:1]
+    if mode == "lg":
+        return SPACY_MODELS[-1:]
+    return SPACY_MODELS
+
+def load_models(names=None, profile=None):
+    """
+    Yapılandırılmış SpaCy modellerini önceden yükler (ör. uygulama başlangıcında veya fork öncesinde).
+    
+    Args:
+        names (list): Yüklenecek model adları. Verilmezse etkin moddaki modeller kullanılır.
+        profile (str): Çalıştırma profili.
+        
+    Returns:
+        list: Yüklenmiş SpaCy modelleri.
+    """
+    return [get_nlp(name, profile) for name in (names or mode_models())]
+
+def doc_orgs(doc):
+    """
+    SpaCy dokümanındaki ORG varlıklarını '@' işaretlerinden arındırarak döndürür.
+    """
+    return {ent.text.replace("@", "") for ent in doc.ents if ent.label_ == "ORG"}
+
+def extract_orgs(texts, mode=None, profile=None, batch_size=64, n_process=1):
+    """
+    Metinlerdeki ORG varlıklarını topluluk moduna göre bir veya birden fazla modelle çıkarır.
+    
+    Args:
+        texts (list): İşlenecek metinler.
+        mode (str): Topluluk modu. Verilmezse `NER_MODE` kullanılır.
+        profile (str): Çalıştırma profili. Verilmezse `SPACY_PROFILE` kullanılır.
+        batch_size (int): SpaCy'nin bir seferde işleyeceği metin sayısı.
+        n_process (int): `nlp.pipe` için çalışan süreç sayısı. Modeller önceden yüklendiği için
+            fork ile oluşturulan süreçler modelleri yeniden yüklemeden paylaşır.
+        
+    Returns:
+        list: Her metin için bulunan ORG adlarının kümesi (girdi sırasıyla).
+    """
+    texts = list(texts)
+    orgs_per_text = [set() for _ in texts]
+    fallback = (mode or NER_MODE) == "fallback"
+    for name in mode_models(mode):
+        # Yedek modda yalnızca önceki modellerin ORG bulamadığı metinler işlenir
+        indices = [i for i, orgs in enumerate(orgs_per_text) if not (fallback and orgs)]
+        if not indices:
+            break
+        n = n_process if len(indices) > batch_size else 1  # Küçük girdilerde süreç başlatma maliyetinden kaçın
+        docs = get_nlp(name, profile).pipe([texts[i] for i in indices], batch_size=batch_size, n_process=n)
+        for i, doc in zip(indices, docs):
+            orgs_per_text[i] |= doc_orgs(doc)
+    return orgs_per_text
+
+class NlpDocument:
+    """
+    Bir isteğin metni için paylaşılan doküman. Metin her model tarafından en fazla bir kez işlenir ve
+    kelimeler, '@' ile anılan hesaplar ve ORG varlıkları tüm aşamalara bu nesne üzerinden sunulur.
+    
+    Özellikler:
+        text (str): İşlenen metin.
+        mode (str): Topluluk modu. Verilmezse `NER_MODE` kullanılır.
+        profile (str): Çalıştırma profili. Verilmezse `SPACY_PROFILE` kullanılır.
+    """
+    
+    def __init__(self, text, mode=None, profile=None):
+        self.text = text
+        self.mode = mode
+        self.profile = profile
+        self._docs = {}
+        self._orgs = None
+    
+    def doc(self, name):
+        """
+        Metnin verilen modelle işlenmiş SpaCy dokümanını döndürür; metin her model için yalnızca bir kez işlenir.
+        
+        Args:
+            name (str): SpaCy model adı.
+            
+        Returns:
+            spacy.tokens.Doc: İşlenmiş doküman.
+        """
+        doc = self._docs.get(name)
+        if doc is None:
+            doc = self._docs[name] = get_nlp(name, self.profile)(self.text)
+        return doc
+    
+    @property
+    def tokens(self):
+        """
+        Metnin boşluklara göre ayrılmış kelimeleri.
+        """
+        return self.text.split(" ")
+    
+    @property
+    def mentions(self):
+        """
+        Metinde '@' işareti ile anılan hesap adları ('@' olmadan).
+        """
+        return [token[1:] for token in self.tokens if token.startswith("@")]
+    
+    @property
+    def orgs(self):
+        """
+        Topluluk moduna göre modellerin bulduğu ORG varlıklarının kümesi.
+        """
+        if self._orgs is None:
+            orgs = set()
+            fallback = (self.mode or NER_MODE) == "fallback"
+            for name in mode_models(self.mode):
+                if fallback and orgs:
+                    break
+                orgs |= doc_orgs(self.doc(name))
+            self._orgs = orgs
+        return self._orgs
+
+def as_document(text):
+    """
+    Metni paylaşılan dokümana dönüştürür; zaten doküman ise olduğu gibi döndürür.
+    """
+    return text if isinstance(text, NlpDocument) else NlpDocument(text)
 
 def special_cases(text, company_set):
     """
     Metindeki özel durumları işler, özellikle '@' işareti ile başlayan şirket adlarını toplar.
     
     Args:
-        text (str): İşlenecek metin.
+        text (str | NlpDocument): İşlenecek metin veya paylaşılan doküman.
         company_set (set): Şirket adlarını tutacak küme.
     """
-    text = text.split(" ")
-    for i in text:
-        if i.startswith("@"):
-            company_set.add(i[1:])  # '@' işaretini kaldırıp şirket adını küme ekle
+    company_set.update(as_document(text).mentions)  # '@' işareti kaldırılmış şirket adlarını kümeye ekle
+
+def gazetteer_matches(text, gazetteer=None):
+    """
+    Orijinal metinde sözlükte bulunan varlıkların güvenilir eşleşmelerini döndürür.
+    
+    Args:
+        text (str): Orijinal (çevrilmemiş) metin.
+        gazetteer (Gazetteer): Kullanılacak sözlük. Verilmezse `get_gazetteer` ile yüklenen sözlük kullanılır.
+        
+    Returns:
+        list: Güvenilir `GazetteerMatch` nesneleri; sözlük yapılandırılmamışsa boş liste.
+    """
+    gazetteer = gazetteer or get_gazetteer()
+    if gazetteer is None:
+        return []
+    return [match for match in gazetteer.find(text) if match.confident]
+
+def _split_known(companies, gazetteer):
+    """
+    Şirket adlarını sözlükte bulunanlar (İngilizce adlarıyla) ve bulunmayanlar olarak ayırır.
+    """
+    if gazetteer is None:
+        return set(), set(companies)
+    known, unknown = set(), set()
+    for company in companies:
+        entry = gazetteer.lookup(company)
+        if entry is not None:
+            known.add(entry.aspect)
+        else:
+            unknown.add(company)
+    return known, unknown
 
-def find_company_names(text, company_set): 
+def find_company_names(text, company_set, gazetteer=None): 
     """
     Metindeki şirket isimlerini tespit eder ve İngilizceye çevirir.
+    Sözlükte bulunan şirket adları çevrilmeden doğrudan İngilizce adlarıyla eklenir.
     
     Args:
-        text (str): Şirket isimlerini bulmak için işlenecek metin.
+        text (str | NlpDocument): Şirket isimlerini bulmak için işlenecek metin veya paylaşılan doküman.
         company_set (set): Şirket adlarını içeren küme.
+        gazetteer (Gazetteer): Bilinen şirket adları sözlüğü.
     """
-    # SpaCy'nin küçük modelini kullanarak metni işle
-    doc_sm = nlp_sm(text)
+    # Topluluk moduna göre SpaCy modelleriyle işlenmiş dokümandan bulunan şirket adlarını al
+    companies = as_document(text).orgs
+    known, companies = _split_known(companies, gazetteer)
+    company_set |= known
     
-    # SpaCy'nin büyük modelini kullanarak metni işle
-    doc_lg = nlp_lg(text)
+    # Şirket adlarını toplu olarak Türkçeye ve tekrar İngilizceye çevir ve küme olarak ekle
+    companies_tr = set(translate_batch_to_tr(companies))
+    company_set |= set(translate_batch_to_en(companies_tr))
+
+def find_company_names_batch(texts, company_sets, batch_size=64, n_process=1, gazetteer=None):
+    """
+    Birden fazla metindeki şirket isimlerini `nlp.pipe` ile toplu olarak tespit eder.
+    Tüm metinlerdeki benzersiz şirket adları tek seferde Türkçeye ve tekrar İngilizceye çevrilir.
+    
+    Args:
+        texts (list): Şirket isimlerini bulmak için işlenecek metinler.
+        company_sets (list): Her metin için şirket adlarının ekleneceği kümeler (metinlerle aynı sırada).
+        batch_size (int): SpaCy'nin bir seferde işleyeceği metin sayısı.
+        n_process (int): `nlp.pipe` için çalışan süreç sayısı.
+        gazetteer (Gazetteer): Bilinen şirket adları sözlüğü.
+    """
+    texts = list(texts)
+    
+    # Her metin için topluluk moduna göre modellerden bulunan şirket adlarını al
+    companies_per_text = extract_orgs(texts, batch_size=batch_size, n_process=n_process)
     
-    # Küçük model ve büyük modelden bulunan şirket adlarını al
-    companies_sm = [ent.text.replace("@", "") for ent in doc_sm.ents if ent.label_ == "ORG"]
-    companies_lg = [ent.text.replace("@", "") for ent in doc_lg.ents if ent.label_ == "ORG"]
+    # Sözlükte bulunmayan benzersiz şirket adlarını toplu olarak Türkçeye, ardından tekrar İngilizceye çevir
+    known, unique_companies = _split_known(set().union(*companies_per_text), gazetteer)
+    unique_companies = sorted(unique_companies)
+    to_tr = dict(zip(unique_companies, translate_batch_to_tr(unique_companies)))
+    unique_tr = sorted(set(to_tr.values()))
+    to_en = dict(zip(unique_tr, translate_batch_to_en(unique_tr)))
     
-    # Şirket adlarını İngilizceye çevir ve küme olarak ekle
-    company_set |= set(map(lambda x: translate_to_en(x), set(map(lambda x: translate_to_tr(x), companies_sm + companies_lg))))
+    for companies, company_set in zip(companies_per_text, company_sets):
+        company_set |= {to_en[to_tr[company]] if company in to_tr else gazetteer.lookup(company).aspect for company in companies}
 
-def change_tr_ner(text, company_set):
+def find_company_names_stream(texts, batch_size=64, n_process=1, chunk_size=10000):
+    """
+    Çok sayıda metin için `special_cases` ve `find_company_names` işlemlerini toplu olarak uygular ve
+    her metnin şirket kümesini girdi sırasıyla akış halinde döndürür. Metinler `chunk_size` büyüklüğünde
+    parçalar halinde okunduğu için bellek kullanımı girdinin boyutundan bağımsızdır.
+    
+    Args:
+        texts (Iterable[str]): İşlenecek metinler (ör. bir dosyadan satır satır okunan tweetler).
+        batch_size (int): SpaCy'nin bir seferde işleyeceği metin sayısı.
+        n_process (int): `nlp.pipe` için çalışan süreç sayısı.
+        chunk_size (int): Bir seferde belleğe alınacak metin sayısı.
+        
+    Yields:
+        set: Her metin için şirket adlarını içeren küme.
+    """
+    # Modeller çalışan süreçler oluşturulmadan önce yüklenir ve onlarla paylaşılır
+    load_models()
+    texts = iter(texts)
+    while True:
+        chunk = list(islice(texts, chunk_size))
+        if not chunk:
+            break
+        company_sets = [set() for _ in chunk]
+        for text, company_set in zip(chunk, company_sets):
+            special_cases(text, company_set)
+        find_company_names_batch(chunk, company_sets, batch_size, n_process, get_gazetteer())
+        yield from company_sets
+
+def change_tr_ner(text, company_set, alignment=None, gazetteer=None, spans=None, matches=None):
     """
     Şirket isimlerini metinde arar ve bulamazsa en yakın eşleşeni bulur.
+    Çeviri sırasında kaydedilmiş parça eşleşmeleri verilirse varlıklar önce doğrudan orijinal metne
+    yansıtılır; Türkçeye çeviri ve bulanık arama yalnızca son çare olarak kullanılır.
     
     Args:
         text (str): Şirket isimlerini aramak için işlenecek metin.
         company_set (set): Şirket adlarını içeren küme.
+        alignment (TranslationAlignment): `translate_to_en_aligned` ile elde edilen parça eşleşmeleri.
+        gazetteer (Gazetteer): Bilinen şirket adları sözlüğü. Sözlüğün orijinal metinde bulduğu
+            şirketler arama yapılmadan doğrudan eklenir.
+        spans (dict): Verilirse her şirket adının metindeki (başlangıç, bitiş) karakter aralığı bu sözlüğe
+            eklenir; böylece sonraki adımların metni yeniden araması gerekmez.
+        matches (list): `gazetteer_matches` ile önceden bulunmuş sözlük eşleşmeleri. Verilmezse metin
+            sözlükte burada aranır.
         
     Returns:
         dict: Metinde bulunan şirket adlarını ve en yakın eşleşenlerini içeren sözlük.
     """
     final_entity_list = {}
+    spans = {} if spans is None else spans
+    missing = []
+    
+    if matches is None:
+        matches = gazetteer_matches(text, gazetteer) if gazetteer is not None else []
+    for match in matches:
+        final_entity_list[match.entry.aspect] = simple_stem(match.surface)
+        spans[match.entry.aspect] = (match.start, match.end)
+    
     for i in company_set:
-        if i.lower() not in text.lower():
-            translated = translate_to_tr(i)
-            if translated in text:
-                final_entity_list[i] = simple_stem(translated)
-            else:
-                # En yakın eşleşeni bulmak için metni parçalara ayır ve karşılaştır
-                print(translated)
-                final_entity_list[i] = simple_stem(find_closest_word(translated, create_distance_list(text.split(" "), len(translated.split(" ")))))
-        else:
+        entry = gazetteer.lookup(i) if gazetteer is not None else None
+        if entry is not None and entry.aspect in final_entity_list:
+            continue  # Sözlük eşleşmesiyle zaten bulundu
+        if i.lower() in text.lower():
             final_entity_list[i] = simple_stem(i)  # Eğer metinde bulunuyorsa, şirket adını olduğu gibi ekle
+            start = fold_case(text).find(fold_case(i))
+            if start != -1:
+                spans[i] = (start, start + len(i))
+            continue
+        span = alignment.project(i) if alignment is not None else None
+        if span is not None:
+            # Çeviri parçalarından orijinal metindeki aralığı doğrudan al
+            final_entity_list[i] = simple_stem(text[span[0]:span[1]])
+            spans[i] = span
+        else:
+            missing.append(i)
+    
+    # Yansıtılamayan şirket adlarını tek seferde Türkçeye çevir
+    translations = dict(zip(missing, translate_batch_to_tr(missing)))
+    
+    index = None
+    for i, translated in translations.items():
+        if translated in text:
+            final_entity_list[i] = simple_stem(translated)
+            start = text.index(translated)
+            spans[i] = (start, start + len(translated))
+        else:
+            # En yakın eşleşeni metnin kelime pencereleri üzerindeki q-gram indeksiyle bul; indeks tüm varlıklar için bir kez oluşturulur
+            index = index or FuzzyWindowIndex(text.split(" "))
+            closest = index.closest_window(translated)
+            if closest is None:
+                # Metin varlıktan daha az kelime içeriyorsa pencere yoktur; çeviri aralıksız olarak kullanılır
+                final_entity_list[i] = simple_stem(translated)
+                continue
+            window, start, end, _ = closest
+            final_entity_list[i] = simple_stem(window)
+            spans[i] = (start, end)
     return final_entity_list
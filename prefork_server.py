@@ -0,0 +1,169 @@
+import argparse
+import gc
+import os
+import signal
+import socket
+import time
+
+import uvicorn
+
+def memory_usage(pid):
+    """
+    Bir sürecin bellek kullanımını /proc/<pid>/smaps_rollup dosyasından okur.
+    Pss (proportional set size), paylaşılan sayfaları paylaşan süreç sayısına böldüğü için
+    copy-on-write ile paylaşılan model belleğinin gerçek maliyetini gösterir.
+
+    Args:
+        pid (int): Süreç kimliği.
+
+    Returns:
+        dict: Rss, Pss, Shared ve Private değerleri (kB). Dosya okunamazsa boş sözlük.
+    """
+    fields = {
+        "Rss": "rss",
+        "Pss": "pss",
+        "Shared_Clean": "shared",
+        "Shared_Dirty": "shared",
+        "Private_Clean": "private",
+        "Private_Dirty": "private",
+    }
+    usage = {"rss": 0, "pss": 0, "shared": 0, "private": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as file:
+            for line in file:
+                name, _, value = line.partition(":")
+                if name in fields:
+                    usage[fields[name]] += int(value.split()[0])
+    except OSError:
+        return {}
+    return usage
+
+def report_memory(pids):
+    """
+    Verilen süreçlerin bellek kullanımını tablo halinde ekrana yazdırır.
+
+    Args:
+        pids (list): Raporlanacak süreç kimlikleri. İlk eleman ana süreç olarak kabul edilir.
+
+    Returns:
+        dict: Süreç kimliği ile bellek kullanımı eşleşmeleri.
+    """
+    report = {pid: memory_usage(pid) for pid in pids}
+    print(f"{'süreç':>10} {'RSS (MB)':>10} {'PSS (MB)':>10} {'paylaşılan (MB)':>16} {'özel (MB)':>10}")
+    for i, (pid, usage) in enumerate(report.items()):
+        if not usage:
+            continue
+        role = "ana" if i == 0 else "çalışan"
+        print(f"{role + ' ' + str(pid):>10} {usage['rss'] / 1024:>10.1f} {usage['pss'] / 1024:>10.1f} "
+              f"{usage['shared'] / 1024:>16.1f} {usage['private'] / 1024:>10.1f}")
+    total_pss = sum(usage.get("pss", 0) for usage in report.values())
+    print(f"Toplam PSS: {total_pss / 1024:.1f} MB")
+    return report
+
+def preload_models():
+    """
+    SpaCy modellerini ve şirket sözlüğünü ana süreçte yükler. Yüklenen nesneler, fork ile oluşturulan
+    çalışanlarla copy-on-write olarak paylaşılır.
+
+    ABSA (BERT) modeli paylaşılamaz: ağırlıkları yüklemek TensorFlow çalışma zamanını ve iş parçacığı
+    havuzlarını başlatır, TensorFlow ise başlatıldıktan sonra fork edilen süreçlerde desteklenmez ve
+    çalışanlarda kilitlenmeye yol açabilir. Bu nedenle her çalışan kendi modelini uygulamanın başlangıç
+    olayında yükler ve modelin belleği çalışan sayısıyla doğrusal artar. TensorFlow modülü ana süreçte
+    içe aktarılır (SpaCy'nin kullandığı thinc ve uygulama modülü aracılığıyla), ancak çalışma zamanı başlatılmaz.
+    """
+    from ner import load_models
+    from gazetteer import get_gazetteer
+
+    load_models()
+    if get_gazetteer() is not None:
+        print("Şirket sözlüğü ana süreçte yüklendi")
+
+def serve_worker(sock, app):
+    """
+    Fork edilmiş çalışan süreçte, ana süreçten devralınan soket üzerinde uvicorn sunucusunu çalıştırır.
+
+    Args:
+        sock (socket.socket): Ana süreçte açılmış dinleme soketi.
+        app (str): Çalıştırılacak ASGI uygulaması ("modül:değişken").
+    """
+    config = uvicorn.Config(app, workers=1, log_level="info")
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+
+def spawn_worker(sock, app):
+    """
+    Yeni bir çalışan süreç oluşturur.
+
+    Returns:
+        int: Çalışan sürecin kimliği.
+    """
+    pid = os.fork()
+    if pid == 0:
+        try:
+            serve_worker(sock, app)
+        finally:
+            os._exit(0)
+    return pid
+
+def main():
+    """
+    SpaCy modellerini bir kez yükleyen ve copy-on-write paylaşımıyla çalışanları fork eden sunucu.
+    ABSA modeli her çalışanda ayrıca yüklenir (bkz. `preload_models`).
+    """
+    parser = argparse.ArgumentParser(description="Modelleri paylaşan çok süreçli sunucu")
+    parser.add_argument("--app", default="teknofest_app:app")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8042)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--report-interval", type=float, default=60, help="Bellek raporu aralığı (saniye), 0 ise kapalı")
+    args = parser.parse_args()
+
+    # Modeller ana süreçte yüklenir, ardından uygulama modülü içe aktarılır
+    preload_models()
+    __import__(args.app.split(":")[0])
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    # Fork öncesinde oluşturulan tüm nesneleri (uygulama modülü dahil) çöp toplayıcının takibinden çıkar;
+    # aksi halde toplayıcının referans sayaçlarına yazması paylaşılan sayfaları kopyalanmaya zorlar
+    gc.collect()
+    gc.freeze()
+
+    workers = [spawn_worker(sock, args.app) for _ in range(args.workers)]
+    print(f"{len(workers)} çalışan başlatıldı: http://{args.host}:{args.port}")
+
+    running = True
+    def stop(signum, frame):
+        nonlocal running
+        running = False
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    last_report = time.monotonic()
+    while running:
+        # Beklenmedik şekilde sonlanan çalışanları yeniden başlat
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            pid = 0
+        if pid and pid in workers:
+            print(f"Çalışan {pid} sonlandı (durum {status}), yeniden başlatılıyor")
+            workers[workers.index(pid)] = spawn_worker(sock, args.app)
+
+        if args.report_interval and time.monotonic() - last_report >= args.report_interval:
+            report_memory([os.getpid()] + workers)
+            last_report = time.monotonic()
+        time.sleep(0.5)
+
+    for pid in workers:
+        os.kill(pid, signal.SIGTERM)
+    for pid in workers:
+        os.waitpid(pid, 0)
+    sock.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+class SingleFlight:
+    """
+    Aynı anahtar için eşzamanlı gelen çağrıları birleştirir: ilk çağıran işi yapar, aynı anda gelen
+    diğer çağıranlar devam eden işin sonucunu bekler. İş parçacıkları ve asyncio ile birlikte kullanılabilir;
+    her iki tür çağıran aynı devam eden işi paylaşır.
+
+    Özellikler:
+        stats (dict): Gerçekten çalıştırılan ("executed") ve birleştirilen ("coalesced") çağrı sayıları.
+    """
+
+    def __init__(self):
+        self.stats = {"executed": 0, "coalesced": 0}
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key):
+        """
+        Anahtar için devam eden işi döndürür veya yeni bir iş kaydı oluşturur.
+
+        Args:
+            key (Hashable): Çağrının anahtarı.
+
+        Returns:
+            tuple: (Future, bool) çifti. bool değeri True ise çağıran işi yapmakla ve `release` çağırmakla yükümlüdür.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self.stats["executed"] += 1
+            return future, True
+
+    def release(self, key, future, result=None, error=None):
+        """
+        İşin sonucunu bekleyenlere iletir ve anahtarı serbest bırakır.
+
+        Args:
+            key (Hashable): Çağrının anahtarı.
+            future (Future): `acquire` ile alınan iş kaydı.
+            result (Any): İşin sonucu.
+            error (BaseException): İş hata ile bittiyse hata nesnesi.
+        """
+        with self._lock:
+            self._calls.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key, fn, *args):
+        """
+        Fonksiyonu anahtar başına aynı anda en fazla bir kez çalıştırır.
+
+        Args:
+            key (Hashable): Çağrının anahtarı.
+            fn (Callable): Çalıştırılacak fonksiyon.
+            *args: Fonksiyona iletilecek argümanlar.
+
+        Returns:
+            Any: Fonksiyonun (veya birleştirilen çağrının) sonucu.
+        """
+        future, leader = self.acquire(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn(*args)
+        except BaseException as error:
+            self.release(key, future, error=error)
+            raise
+        self.release(key, future, result)
+        return result
+
+    async def do_async(self, key, fn, *args):
+        """
+        `do` metodunun asyncio karşılığı. `fn` bir coroutine fonksiyonudur.
+
+        Args:
+            key (Hashable): Çağrının anahtarı.
+            fn (Callable): Çalıştırılacak coroutine fonksiyonu.
+            *args: Fonksiyona iletilecek argümanlar.
+
+        Returns:
+            Any: Fonksiyonun (veya birleştirilen çağrının) sonucu.
+        """
+        future, leader = self.acquire(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+        try:
+            result = await fn(*args)
+        except BaseException as error:
+            self.release(key, future, error=error)
+            raise
+        self.release(key, future, result)
+        return result
@@ -1,10 +1,115 @@
+import asyncio
+import os
 import uvicorn
-from fastapi import FastAPI
+from typing import List
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response
 from pydantic import BaseModel, Field
 from main import MainModel
+from utils_text import translate_to_en_aligned_async
+from ebsa_model import warm_up, enable_micro_batching, enable_compilation
+from inference_pool import InferencePool, PoolFullError, ClientDisconnectedError
 
 app = FastAPI()
 
+# Çıkarım işlerinin olay döngüsü dışında çalıştırıldığı havuz (uygulama başlarken oluşturulur)
+pool = None
+
+def configure_models():
+    """
+    ABSA modelini önceden yükler ve yapılandırılmışsa istekler arası batch oluşturmayı başlatır.
+    Süreç havuzu kullanıldığında her çalışan süreç tarafından da çağrılır.
+    """
+    load_time = warm_up()
+    print(f"ABSA modeli hazır (yükleme süresi: {load_time:.2f} sn)")
+
+    # NYMAI_COMPILE "1" ise tahmin fonksiyonu tf.function ile, "xla" ise XLA ile derlenir
+    compile_mode = os.environ.get("NYMAI_COMPILE", "0")
+    if compile_mode != "0":
+        compile_time = enable_compilation(jit_compile=compile_mode == "xla")
+        print(f"Tahmin fonksiyonu derlendi ({compile_time:.2f} sn)")
+
+    # NYMAI_BATCH_WAIT_MS tanımlıysa eşzamanlı istekler tek bir model geçişinde birleştirilir
+    if os.environ.get("NYMAI_BATCH_WAIT_MS"):
+        enable_micro_batching(
+            max_wait_ms=float(os.environ["NYMAI_BATCH_WAIT_MS"]),
+            max_batch_size=int(os.environ.get("NYMAI_BATCH_SIZE", 32)),
+            max_tokens=int(os.environ.get("NYMAI_BATCH_MAX_TOKENS", 8192))
+        )
+
+@app.on_event("startup")
+def load_models():
+    """
+    Uygulama başlarken modelleri yükler ve çalışan havuzunu oluşturur.
+    Havuz NYMAI_WORKERS, NYMAI_QUEUE_SIZE ve NYMAI_EXECUTOR (thread/process) ile yapılandırılır.
+    """
+    global pool
+    use_processes = os.environ.get("NYMAI_EXECUTOR", "thread") == "process"
+    if not use_processes:
+        configure_models()
+    pool = InferencePool(
+        max_workers=int(os.environ.get("NYMAI_WORKERS", 4)),
+        max_queue=int(os.environ.get("NYMAI_QUEUE_SIZE", 32)),
+        use_processes=use_processes,
+        initializer=configure_models if use_processes else None
+    )
+
+@app.on_event("shutdown")
+def close_pool():
+    """
+    Uygulama kapanırken çalışan havuzunu kapatır.
+    """
+    if pool is not None:
+        pool.shutdown()
+
+def analyze_text(text, alignment=None):
+    """
+    Tek bir metni analiz eder. Çalışan havuzunda yürütülür.
+    
+    Args:
+        text (str): İşlenecek metin.
+        alignment (TranslationAlignment): Olay döngüsünde yapılmış çeviri.
+        
+    Returns:
+        dict: Modelin tahmin sonuçlarını içeren bir sözlük.
+    """
+    my_model = MainModel()
+    my_model.execute_model(text, alignment)
+    return my_model.take_outputs()
+
+def analyze_texts(texts, alignments=None):
+    """
+    Metin listesini toplu olarak analiz eder. Çalışan havuzunda yürütülür.
+    
+    Args:
+        texts (list): İşlenecek metinlerin listesi.
+        alignments (list): Olay döngüsünde yapılmış çeviriler (girdi sırasıyla).
+        
+    Returns:
+        list: Her metin için modelin tahmin sonuçlarını içeren sözlüklerin listesi.
+    """
+    return MainModel().execute_batch(texts, alignments)
+
+async def run_in_pool(request, fn, *args):
+    """
+    İşi çalışan havuzunda yürütür; havuz doluysa 503 döndürür, istemci ayrılırsa işi iptal eder.
+    
+    Args:
+        request (Request): İstemci bağlantısını kontrol etmek için kullanılan istek nesnesi.
+        fn (Callable): Havuzda çalıştırılacak fonksiyon.
+        *args: Fonksiyona iletilecek argümanlar.
+        
+    Returns:
+        Any: Fonksiyonun sonucu veya istemci ayrıldıysa boş bir yanıt.
+    """
+    try:
+        return await pool.run(fn, *args, is_disconnected=request.is_disconnected)
+    except PoolFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except ClientDisconnectedError:
+        # İstemci ayrıldığı için yanıt kimseye ulaşmayacak
+        return Response(status_code=499)
+
 class Item(BaseModel):
     """
     API'nin alacağı veri modelini tanımlar.
@@ -16,26 +121,46 @@ class Item(BaseModel):
     text: str = Field(..., example="""Turkcell icra kurulu başkanı aramıza katıldı""")
 
 @app.post("/predict/", response_model=dict)
-async def predict(item: Item):
+async def predict(item: Item, request: Request):
     """
     Verilen metni işleyip modelden tahmin sonuçlarını döndüren bir API uç noktası.
+    Çeviri olay döngüsünde beklenir (aynı metin için eşzamanlı istekler tek çeviri çağrısını paylaşır),
+    model ise olay döngüsü dışında, çalışan havuzunda çalıştırılır.
     
     Args:
         item (Item): API'ye gönderilen verileri içeren model.
+        request (Request): İstemci bağlantısını izlemek için kullanılan istek nesnesi.
         
     Returns:
         dict: Modelin tahmin sonuçlarını içeren bir sözlük.
     """
-    # Modeli başlat
-    my_model = MainModel()
-    
-    # Modeli verilerle çalıştır
-    my_model.execute_model(item.text)
+    alignment = await translate_to_en_aligned_async(item.text)
+    return await run_in_pool(request, analyze_text, item.text, alignment)
+
+class BatchItem(BaseModel):
+    """
+    Toplu analiz uç noktasının alacağı veri modelini tanımlar.
     
-    # Modelden sonuçları al
-    result = my_model.take_outputs()
+    Attributes:
+        texts (List[str]): İşlenecek metinlerin listesi.
+    """
+    texts: List[str] = Field(..., example=["""Turkcell icra kurulu başkanı aramıza katıldı"""])
+
+@app.post("/predict/batch", response_model=List[dict])
+async def predict_batch(item: BatchItem, request: Request):
+    """
+    Verilen metin listesini toplu olarak işleyip her metin için tahmin sonuçlarını döndüren bir API uç noktası.
+    Metinler olay döngüsünde eşzamanlı çevrilir, model çalışan havuzunda çalıştırılır.
     
-    return result
+    Args:
+        item (BatchItem): API'ye gönderilen metin listesini içeren model.
+        request (Request): İstemci bağlantısını izlemek için kullanılan istek nesnesi.
+        
+    Returns:
+        List[dict]: Her metin için modelin tahmin sonuçlarını içeren sözlüklerin listesi (girdi sırasıyla).
+    """
+    alignments = await asyncio.gather(*(translate_to_en_aligned_async(text) for text in item.texts))
+    return await run_in_pool(request, analyze_texts, item.texts, list(alignments))
 
 if __name__ == "__main__":
     # FastAPI uygulamasını başlat
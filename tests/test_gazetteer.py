@@ -0,0 +1,62 @@
+import pytest
+
+from gazetteer import Gazetteer, GazetteerEntry
+
+
+@pytest.fixture
+def gazetteer():
+    return Gazetteer([
+        GazetteerEntry("Turkcell"),
+        GazetteerEntry("Garanti"),
+        GazetteerEntry("Türk Hava Yolları", "Turkish Airlines", ["THY"]),
+    ])
+
+
+def found(gazetteer, text):
+    return [(match.entry.aspect, match.surface, match.confident) for match in gazetteer.find(text)]
+
+
+@pytest.mark.parametrize("text, aspect, surface", [
+    ("Garanti çok iyi", "Garanti", "Garanti"),
+    ("Garantiye gittim", "Garanti", "Garanti"),
+    ("Garantisi bitti", "Garanti", "Garanti"),
+    ("Garantisinden memnunum", "Garanti", "Garanti"),
+    ("Turkcellin faturası", "Turkcell", "Turkcell"),
+    ("Turkcelli aradım", "Turkcell", "Turkcell"),
+    ("Turkcellinin faturası", "Turkcell", "Turkcell"),
+    ("Turkcell'in faturası", "Turkcell", "Turkcell"),
+    ("THY'nin uçağı", "Turkish Airlines", "THY"),
+    ("THY'sinden bilet aldım", "Turkish Airlines", "THY"),
+    ("Türk Hava Yollarının uçağı", "Turkish Airlines", "Türk Hava Yolları"),
+    ("TÜRK HAVA YOLLARI'na", "Turkish Airlines", "TÜRK HAVA YOLLARI"),
+])
+def test_matches_inflections(gazetteer, text, aspect, surface):
+    # Eşleşme aralığı eki içermez; yalnızca şirket adını kapsar
+    assert found(gazetteer, text) == [(aspect, surface, True)]
+
+
+@pytest.mark.parametrize("text", [
+    "Garantisel bir yaklaşım",
+    "Garantilik belgesi",
+    "Turkcellxyz kampanyası",
+    "MegaTurkcell",
+    "garantisiz ürün",
+])
+def test_rejects_unknown_suffixes_and_embedded_names(gazetteer, text):
+    assert found(gazetteer, text) == []
+
+
+def test_short_lowercase_alias_is_not_confident(gazetteer):
+    assert found(gazetteer, "thy ile uçtum") == [("Turkish Airlines", "thy", False)]
+    assert found(gazetteer, "THY ile uçtum") == [("Turkish Airlines", "THY", True)]
+
+
+def test_offsets_point_into_original_text(gazetteer):
+    text = "Dün İstanbul'da Turkcell'in ve Garantisi'nin"
+    for match in gazetteer.find(text):
+        assert text[match.start:match.end] == match.surface
+
+
+def test_lookup(gazetteer):
+    assert gazetteer.lookup("thy").aspect == "Turkish Airlines"
+    assert gazetteer.lookup("Vodafone") is None
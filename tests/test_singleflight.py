@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight
+
+N = 8
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "koşul zaman aşımına uğradı"
+        time.sleep(0.001)
+
+
+def run_concurrently(flight, fn):
+    results, errors = [None] * N, [None] * N
+
+    def call(i):
+        try:
+            results[i] = flight.do("anahtar", fn)
+        except Exception as error:
+            errors[i] = error
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(N)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_identical_calls_execute_once():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return "sonuç"
+
+    threads, results, errors = run_concurrently(flight, work)
+    # Lider işi yürütürken diğer tüm çağıranların beklemeye geçmesini bekle
+    wait_until(lambda: flight.stats["coalesced"] == N - 1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == ["sonuç"] * N
+    assert errors == [None] * N
+    assert flight.stats == {"executed": 1, "coalesced": N - 1}
+
+
+def test_error_propagates_to_waiters():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def work():
+        release.wait(5)
+        raise ValueError("arka uç hatası")
+
+    threads, results, errors = run_concurrently(flight, work)
+    wait_until(lambda: flight.stats["coalesced"] == N - 1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert len({id(error) for error in errors}) == 1  # Bekleyenler liderin hatasını alır
+
+
+def test_key_is_released_after_call():
+    flight = SingleFlight()
+    assert flight.do("anahtar", lambda: 1) == 1
+    with pytest.raises(KeyError):
+        flight.do("anahtar", lambda: {}["yok"])
+    assert flight.do("anahtar", lambda: 2) == 2
+    assert flight.stats == {"executed": 3, "coalesced": 0}
+
+
+def test_async_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "sonuç"
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async("anahtar", work) for _ in range(N)))
+
+    assert asyncio.run(main()) == ["sonuç"] * N
+    assert calls == [1]
+    assert flight.stats == {"executed": 1, "coalesced": N - 1}
+
+
+def test_async_error_propagates_to_waiters():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("arka uç hatası")
+
+    async def main():
+        return await asyncio.gather(*(flight.do_async("anahtar", work) for _ in range(N)), return_exceptions=True)
+
+    errors = asyncio.run(main())
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert flight.stats["executed"] == 1
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("deep_translator")
+
+from translators import CachedTranslator, CoalescingTranslator, Translator
+from translation_cache import TranslationCache
+
+N = 8
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "koşul zaman aşımına uğradı"
+        time.sleep(0.001)
+
+
+class SlowTranslator(Translator):
+    """
+    Çağrıları sayan ve serbest bırakılana kadar bekleyen sahte arka uç.
+    """
+
+    def __init__(self, error=None):
+        self.calls = []
+        self.release = threading.Event()
+        self.error = error
+
+    def translate(self, text, source, target):
+        self.calls.append(text)
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return text.upper()
+
+
+def test_concurrent_identical_translations_hit_backend_once():
+    backend = SlowTranslator()
+    translator = CoalescingTranslator(backend)
+    results = [None] * N
+
+    def call(i):
+        results[i] = translator.translate("merhaba", "tr", "en")
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(N)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: translator.flight.stats["coalesced"] == N - 1)
+    backend.release.set()
+    for thread in threads:
+        thread.join()
+
+    assert backend.calls == ["merhaba"]
+    assert results == ["MERHABA"] * N
+
+
+def test_backend_error_reaches_every_waiter():
+    backend = SlowTranslator(error=RuntimeError("servis hatası"))
+    translator = CoalescingTranslator(backend)
+    errors = [None] * N
+
+    def call(i):
+        try:
+            translator.translate("merhaba", "tr", "en")
+        except RuntimeError as error:
+            errors[i] = error
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(N)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: translator.flight.stats["coalesced"] == N - 1)
+    backend.release.set()
+    for thread in threads:
+        thread.join()
+
+    assert backend.calls == ["merhaba"]
+    assert all(isinstance(error, RuntimeError) for error in errors)
+
+
+def test_async_translations_through_cache_hit_backend_once():
+    backend = SlowTranslator()
+    backend.release.set()
+    translator = CachedTranslator(CoalescingTranslator(backend), TranslationCache(memory_size=10))
+
+    async def main():
+        return await asyncio.gather(*(translator.translate_async("merhaba", "tr", "en") for _ in range(N)))
+
+    assert asyncio.run(main()) == ["MERHABA"] * N
+    assert backend.calls == ["merhaba"]
+    assert translator.translate("merhaba", "tr", "en") == "MERHABA"  # Önbellekten
+    assert backend.calls == ["merhaba"]
@@ -0,0 +1,141 @@
+import random
+
+import pytest
+
+from utils_ner import levenshtein_distance, edit_distance, find_closest_word, FuzzyWindowIndex, iter_windows, create_distance_list
+
+ALPHABET = "abcçdeğıiklmnoöprsştuüy "
+
+
+def random_text(rng, low, high):
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(low, high)))
+
+
+@pytest.mark.parametrize("low, high", [(0, 8), (20, 63), (60, 70), (64, 200)])
+def test_edit_distance_matches_reference(low, high):
+    rng = random.Random(low * 1000 + high)
+    for _ in range(60):
+        s1, s2 = random_text(rng, low, high), random_text(rng, low, high)
+        assert edit_distance(s1, s2) == levenshtein_distance(s1, s2)
+
+
+def test_edit_distance_long_strings_with_small_edits():
+    rng = random.Random(7)
+    for length in (63, 64, 65, 128, 129, 300):
+        s1 = random_text(rng, length, length)
+        s2 = list(s1)
+        for _ in range(3):
+            s2[rng.randrange(length)] = rng.choice(ALPHABET)
+        s2 = "".join(s2)
+        assert edit_distance(s1, s2) == levenshtein_distance(s1, s2)
+
+
+@pytest.mark.parametrize("s1, s2", [
+    ("turkcell", "turkcel"),
+    ("garanti bankası", "garanti bbva"),
+    ("a" * 70, "b" * 70),
+    ("x" * 65 + "abc", "x" * 65 + "abd"),
+])
+def test_edit_distance_cutoff_boundary(s1, s2):
+    distance = levenshtein_distance(s1, s2)
+    # Mesafe sınıra eşit veya altındaysa kesin değer, üstündeyse sınır + 1 döner
+    assert edit_distance(s1, s2, distance) == distance
+    assert edit_distance(s1, s2, distance + 5) == distance
+    if distance > 0:
+        assert edit_distance(s1, s2, distance - 1) == distance
+    for cutoff in range(max(0, distance - 3), distance - 1):
+        assert edit_distance(s1, s2, cutoff) == cutoff + 1
+
+
+def test_edit_distance_cutoff_randomized():
+    rng = random.Random(3)
+    for _ in range(300):
+        s1, s2 = random_text(rng, 0, 90), random_text(rng, 0, 90)
+        distance = levenshtein_distance(s1, s2)
+        cutoff = rng.randint(0, 90)
+        assert edit_distance(s1, s2, cutoff) == (distance if distance <= cutoff else cutoff + 1)
+
+
+def test_edit_distance_empty_strings():
+    assert edit_distance("", "") == 0
+    assert edit_distance("", "abc") == 3
+    assert edit_distance("abc", "", 1) == 2
+
+
+def test_find_closest_word_matches_reference():
+    rng = random.Random(11)
+    for _ in range(100):
+        words = [random_text(rng, 1, 12).strip() or "x" for _ in range(rng.randint(1, 15))]
+        word = random_text(rng, 1, 12)
+        expected = min(words, key=lambda w: levenshtein_distance(word, w))
+        assert find_closest_word(word, words) == expected
+
+
+def reference_windows(words, count):
+    return [" ".join(words[i:i + count]).strip() for i in range(len(words) - count + 1)]
+
+
+def test_fuzzy_window_index_matches_reference():
+    rng = random.Random(5)
+    vocabulary = ["turkcell", "garanti", "bankası", "türk", "hava", "yolları", "çok", "iyi", "kötü", "fatura", "thy", "a"]
+    for _ in range(150):
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(1, 12))]
+        index = FuzzyWindowIndex(words)
+        for _ in range(3):
+            word = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 3)))
+            if rng.random() < 0.5:
+                word = word.replace(rng.choice(word), rng.choice(ALPHABET), 1)
+            windows = reference_windows(words, len(word.split(" ")))
+            if not windows:
+                assert index.closest(word) is None
+                continue
+            # Eşit mesafelerde metinde önce gelen pencere seçilir
+            expected = min(windows, key=lambda w: levenshtein_distance(word, w))
+            assert index.closest(word) == expected
+
+
+def test_fuzzy_window_index_without_shared_qgrams():
+    words = "xyz qqq wwww".split(" ")
+    index = FuzzyWindowIndex(words)
+    for word in ("ab", "abcdefgh", "mnop"):
+        assert index.closest(word) == min(words, key=lambda w: levenshtein_distance(word, w))
+
+
+def test_closest_window_returns_none_for_short_text():
+    index = FuzzyWindowIndex(["turkcell"])
+    assert index.closest_window("türk hava yolları") is None
+    assert index.closest("türk hava yolları") is None
+    assert FuzzyWindowIndex([]).closest_window("turkcell") is None
+
+
+def test_closest_window_explicit_count():
+    words = "bugün türk hava yolları ile uçtum".split(" ")
+    index = FuzzyWindowIndex(words)
+    expected = min(reference_windows(words, 3), key=lambda w: levenshtein_distance("thy hava", w))
+    assert index.closest("thy hava", count=3) == expected
+    assert index.closest("türk hava yolari", count=3) == "türk hava yolları"
+
+
+@pytest.mark.parametrize("text", [
+    "Turkcell çok iyi",
+    "Garanti  bankası ile  sorun yaşadım",
+    " baştaki ve sondaki boşluklar ",
+    "tek",
+    "",
+])
+def test_iter_windows_offsets(text):
+    words = text.split(" ")
+    for count in (1, 2, 3):
+        windows = list(iter_windows(words, count))
+        assert [w for w, _, _, _ in windows] == reference_windows(words, count)
+        for window, start, end, (i, j) in windows:
+            assert text[start:end] == window
+            assert j - i == count
+
+
+def test_iter_windows_multiple_counts_in_one_pass():
+    words = "bugün türk hava yolları ile uçtum".split(" ")
+    windows = list(iter_windows(words, (3, 1)))
+    for count in (1, 3):
+        assert [w for w, _, _, (i, j) in windows if j - i == count] == reference_windows(words, count)
+    assert create_distance_list(words, 2) == reference_windows(words, 2)
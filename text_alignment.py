@@ -0,0 +1,206 @@
+import re
+
+from utils_ner import edit_distance
+
+# Cümle sonu noktalama işaretine veya satır sonuna kadar uzanan parçalar
+SEGMENT_PATTERN = re.compile(r"[^.!?\n]+(?:[.!?]+|$)|[.!?]+", re.MULTILINE)
+WORD_PATTERN = re.compile(r"\S+")
+
+def fold_case(text):
+    """
+    Metni karakter sayısını koruyarak küçük harfe çevirir. `str.lower` 'İ' harfini iki karaktere
+    dönüştürdüğü için karakter indeksleri kayar; bu fonksiyon indeksleri korur.
+
+    Args:
+        text (str): Dönüştürülecek metin.
+
+    Returns:
+        str: Aynı uzunlukta küçük harfli metin.
+    """
+    return text.replace("İ", "i").lower()
+
+def _split_long_span(text, start, end, max_chars):
+    """
+    `max_chars` karakterden uzun bir aralığı, mümkünse boşluklardan bölerek daha kısa aralıklara ayırır.
+    """
+    while end - start > max_chars:
+        cut = text.rfind(" ", start, start + max_chars)
+        if cut <= start:
+            cut = start + max_chars
+        yield start, cut
+        start = cut
+        while start < end and text[start].isspace():
+            start += 1
+    if start < end:
+        yield start, end
+
+def _merge_spans(spans, max_chars):
+    """
+    Ardışık aralıkları toplam uzunluk `max_chars` karakteri geçmeyecek şekilde birleştirir.
+    """
+    merged = []
+    for start, end in spans:
+        if merged and end - merged[-1][0] <= max_chars:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+def split_segments(text, max_chars=None, merge=False):
+    """
+    Metni cümle düzeyinde parçalara ayırır ve her parçanın karakter aralığını döndürür.
+    Baştaki ve sondaki boşluklar aralığa dahil edilmez.
+
+    Args:
+        text (str): Parçalanacak metin.
+        max_chars (int): Bir parçanın en fazla karakter sayısı. Daha uzun cümleler boşluklardan bölünür.
+        merge (bool): True ise ardışık cümleler `max_chars` sınırına kadar tek parçada birleştirilir.
+
+    Returns:
+        list: (başlangıç, bitiş) karakter aralıklarının listesi.
+    """
+    spans = []
+    for match in SEGMENT_PATTERN.finditer(text):
+        segment = match.group()
+        stripped = segment.strip()
+        if not stripped:
+            continue
+        start = match.start() + (len(segment) - len(segment.lstrip()))
+        spans.append((start, start + len(stripped)))
+    if max_chars:
+        spans = [piece for start, end in spans for piece in _split_long_span(text, start, end, max_chars)]
+        if merge:
+            spans = _merge_spans(spans, max_chars)
+    return spans
+
+class TranslationAlignment:
+    """
+    Kaynak metin ile çevirisi arasındaki parça (cümle) eşleşmelerini tutar ve
+    çeviri üzerindeki varlıkları kaynak metindeki karakter aralıklarına geri yansıtır.
+
+    Özellikler:
+        source (str): Kaynak (orijinal) metin.
+        target (str): Parçaların çevirilerinin birleştirilmesiyle oluşan metin.
+        segments (list): (kaynak başlangıç, kaynak bitiş, hedef başlangıç, hedef bitiş) dörtlüleri.
+    """
+
+    def __init__(self, source, target, segments):
+        self.source = source
+        self.target = target
+        self.segments = segments
+
+    def source_spans(self, start, end):
+        """
+        Hedef metindeki bir aralıkla örtüşen kaynak parçaların aralıklarını döndürür.
+
+        Args:
+            start (int): Hedef metindeki başlangıç indeksi.
+            end (int): Hedef metindeki bitiş indeksi.
+
+        Returns:
+            list: Kaynak metindeki (başlangıç, bitiş) aralıkları.
+        """
+        return [(s_start, s_end) for s_start, s_end, t_start, t_end in self.segments if t_start < end and start < t_end]
+
+    def project(self, entity, max_ratio=0.34):
+        """
+        Çeviride geçen bir varlığın kaynak metindeki karakter aralığını bulur. Önce varlığın geçtiği
+        parçalara karşılık gelen kaynak parçalarda birebir, ardından bulanık arama yapılır.
+
+        Args:
+            entity (str): Hedef (çevrilmiş) metinde geçen varlık adı.
+            max_ratio (float): Bulanık eşleşmede kabul edilen en yüksek edit mesafesi / uzunluk oranı.
+
+        Returns:
+            tuple: Kaynak metindeki (başlangıç, bitiş) aralığı veya bulunamazsa None.
+        """
+        needle = fold_case(entity)
+        if not needle:
+            return None
+        spans = []
+        for match in re.finditer(re.escape(needle), fold_case(self.target)):
+            spans.extend(span for span in self.source_spans(match.start(), match.end()) if span not in spans)
+
+        source = fold_case(self.source)
+        for start, end in spans:
+            index = source.find(needle, start, end)
+            if index != -1:
+                return index, index + len(needle)
+
+        # Birebir eşleşme yoksa yalnızca ilgili kaynak parçalardaki kelime pencerelerine bak; kabul sınırını
+        # veya bulunan en iyi mesafeyi geçemeyeceği anlaşılan pencereler erken elenir
+        count = len(needle.split())
+        cutoff = int(max_ratio * len(needle))
+        best = None
+        for start, end in spans:
+            words = list(WORD_PATTERN.finditer(self.source, start, end))
+            for i in range(len(words) - count + 1):
+                w_start, w_end = words[i].start(), words[i + count - 1].end()
+                distance = edit_distance(needle, source[w_start:w_end], cutoff)
+                if distance <= cutoff:
+                    best, cutoff = (w_start, w_end), distance - 1
+                    if cutoff < 0:
+                        return best
+        return best
+
+def align_translation(source, target):
+    """
+    Tüm metin tek seferde çevrildikten sonra kaynak ve çeviri cümlelerini eşleştirir. Cümle sayıları
+    eşitse cümleler sırayla eşlenir; değilse (çeviri cümleleri birleştirdiyse veya böldüyse) tüm metin
+    tek bir parça olarak eşlenir ve yansıtma tüm kaynak metinde arama yapar.
+
+    Args:
+        source (str): Kaynak metin.
+        target (str): Kaynak metnin çevirisi.
+
+    Returns:
+        TranslationAlignment: Parça eşleşmeleri.
+    """
+    target = target or ""
+    source_spans = split_segments(source)
+    target_spans = split_segments(target)
+    if len(source_spans) == len(target_spans):
+        segments = [s + t for s, t in zip(source_spans, target_spans)]
+    else:
+        segments = [(0, len(source), 0, len(target))]
+    return TranslationAlignment(source, target, segments)
+
+def _build_alignment(text, spans, translations):
+    """
+    Kaynak parçaları ve çevirilerinden hizalama nesnesi oluşturur.
+    """
+    pieces = []
+    segments = []
+    offset = 0
+    for (start, end), translation in zip(spans, translations):
+        translation = (translation or "").strip()
+        if pieces:
+            offset += 1  # Parçalar arasındaki boşluk
+        pieces.append(translation)
+        segments.append((start, end, offset, offset + len(translation)))
+        offset += len(translation)
+    return TranslationAlignment(text, " ".join(pieces), segments)
+
+def translate_aligned_batch(texts, translate_batch, max_chars=None, merge=False):
+    """
+    Metinleri cümle parçalarına ayırarak çevirir ve her metin için parça eşleşmelerini kaydeder.
+    Tüm metinlerin parçaları tek bir toplu çeviri çağrısında gönderilir; böylece uzun metinlerin
+    parçaları eşzamanlı çevrilir ve parça düzeyinde önbelleğe alınabilir.
+
+    Args:
+        texts (list): Çevrilecek metinler.
+        translate_batch (Callable): Metin listesini çeviren fonksiyon.
+        max_chars (int): Bir parçanın en fazla karakter sayısı.
+        merge (bool): True ise kısa cümleler `max_chars` sınırına kadar birleştirilerek istek sayısı azaltılır.
+
+    Returns:
+        list: Her metin için `TranslationAlignment` nesnesi (girdi sırasıyla).
+    """
+    texts = list(texts)
+    spans_per_text = [split_segments(text, max_chars, merge) for text in texts]
+    pieces = [text[start:end] for text, spans in zip(texts, spans_per_text) for start, end in spans]
+    translations = iter(translate_batch(pieces))
+    return [
+        _build_alignment(text, spans, [next(translations) for _ in spans])
+        for text, spans in zip(texts, spans_per_text)
+    ]
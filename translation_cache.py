@@ -0,0 +1,144 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+class TranslationCache:
+    """
+    (kaynak, hedef, metin) anahtarlı iki katmanlı çeviri önbelleği: süreç içi LRU ve tüm çalışan
+    süreçlerin paylaştığı sqlite dosyası. Her iki katmanda da süre (TTL) ve boyut sınırı uygulanır.
+
+    Özellikler:
+        memory_size (int): Süreç içi LRU katmanındaki en fazla kayıt sayısı.
+        path (str): Disk katmanının sqlite dosya yolu. None ise yalnızca bellek katmanı kullanılır.
+        disk_size (int): Disk katmanındaki en fazla kayıt sayısı.
+        ttl (float): Kayıtların geçerlilik süresi (saniye). None ise süresizdir.
+        stats (dict): Bellek isabeti, disk isabeti ve ıskalama sayaçları.
+    """
+
+    # Disk katmanında temizlik kaç yazmada bir yapılır
+    EVICTION_INTERVAL = 100
+
+    def __init__(self, memory_size=10000, path=None, disk_size=1000000, ttl=None):
+        self.memory_size = memory_size
+        self.path = path
+        self.disk_size = disk_size
+        self.ttl = ttl
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes = 0
+        if path:
+            self._connection().execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "source TEXT, target TEXT, text TEXT, translation TEXT, created REAL, "
+                "PRIMARY KEY (source, target, text))"
+            )
+
+    def _connection(self):
+        """
+        İş parçacığı ve süreç başına ayrı bir sqlite bağlantısı döndürür.
+        Fork sonrası devralınan bağlantılar kullanılmaz.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _is_fresh(self, created):
+        return self.ttl is None or time.time() - created < self.ttl
+
+    def get(self, source, target, text):
+        """
+        Önbellekteki çeviriyi döndürür. Disk katmanında bulunan kayıt bellek katmanına da alınır.
+
+        Args:
+            source (str): Kaynak dil kodu.
+            target (str): Hedef dil kodu.
+            text (str): Çevrilecek metin.
+
+        Returns:
+            str: Önbellekteki çeviri veya bulunamazsa None.
+        """
+        key = (source, target, text)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and self._is_fresh(entry[1]):
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return entry[0]
+            self._memory.pop(key, None)
+
+        if self.path:
+            row = self._connection().execute(
+                "SELECT translation, created FROM translations WHERE source=? AND target=? AND text=?", key
+            ).fetchone()
+            if row is not None and self._is_fresh(row[1]):
+                self._remember(key, row[0], row[1])
+                with self._lock:
+                    self.stats["disk_hits"] += 1
+                return row[0]
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def put(self, source, target, text, translation):
+        """
+        Çeviriyi her iki katmana yazar.
+
+        Args:
+            source (str): Kaynak dil kodu.
+            target (str): Hedef dil kodu.
+            text (str): Çevrilen metin.
+            translation (str): Çeviri sonucu.
+        """
+        key = (source, target, text)
+        created = time.time()
+        self._remember(key, translation, created)
+        if not self.path:
+            return
+        connection = self._connection()
+        connection.execute("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)", key + (translation, created))
+        with self._lock:
+            self._writes += 1
+            evict = self._writes % self.EVICTION_INTERVAL == 0
+        if evict:
+            self._evict(connection)
+
+    def _remember(self, key, translation, created):
+        """
+        Kaydı bellek katmanına ekler ve boyut sınırını aşan en eski kayıtları atar.
+        """
+        with self._lock:
+            self._memory[key] = (translation, created)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def _evict(self, connection):
+        """
+        Disk katmanından süresi dolmuş kayıtları ve boyut sınırını aşan en eski kayıtları siler.
+        """
+        if self.ttl is not None:
+            connection.execute("DELETE FROM translations WHERE created < ?", (time.time() - self.ttl,))
+        connection.execute(
+            "DELETE FROM translations WHERE rowid IN (SELECT rowid FROM translations ORDER BY created DESC LIMIT -1 OFFSET ?)",
+            (self.disk_size,)
+        )
+
+    def hit_rate(self):
+        """
+        Toplam isabet oranını döndürür.
+
+        Returns:
+            float: İsabetlerin tüm sorgulara oranı (sorgu yoksa 0).
+        """
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
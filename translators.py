@@ -0,0 +1,392 @@
+import asyncio
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+import deep_translator.google
+import requests
+from deep_translator import GoogleTranslator
+from requests.adapters import HTTPAdapter
+
+from singleflight import SingleFlight
+from translation_cache import TranslationCache
+
+class Translator(ABC):
+    """
+    Çeviri arka uçları için ortak arayüz.
+    """
+
+    @abstractmethod
+    def translate(self, text, source, target):
+        """
+        Metni kaynak dilden hedef dile çevirir.
+
+        Args:
+            text (str): Çevrilecek metin.
+            source (str): Kaynak dil kodu ('auto' otomatik algılama anlamına gelir).
+            target (str): Hedef dil kodu.
+
+        Returns:
+            str: Çevrilmiş metin.
+        """
+
+    def translate_batch(self, texts, source, target):
+        """
+        Metin listesini çevirir. Varsayılan olarak metinleri tek tek çevirir;
+        toplu çeviriyi destekleyen arka uçlar bu metodu yeniden tanımlar.
+
+        Args:
+            texts (list): Çevrilecek metinler.
+            source (str): Kaynak dil kodu.
+            target (str): Hedef dil kodu.
+
+        Returns:
+            list: Girdi sırasıyla çevrilmiş metinler.
+        """
+        return [self.translate(text, source, target) for text in texts]
+
+    async def translate_async(self, text, source, target):
+        """
+        Metni olay döngüsünü engellemeden çevirir. Varsayılan olarak `translate` iş parçacığı havuzunda çalıştırılır.
+
+        Args:
+            text (str): Çevrilecek metin.
+            source (str): Kaynak dil kodu.
+            target (str): Hedef dil kodu.
+
+        Returns:
+            str: Çevrilmiş metin.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.translate, text, source, target)
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+def http_session():
+    """
+    Süreç başına paylaşılan HTTP oturumunu döndürür. Oturum bağlantıları havuzda tutarak yeniden kullanır;
+    havuz boyutu NYMAI_TRANSLATION_CONCURRENCY kadardır. Oturum ilk kullanımda ve fork sonrası her süreçte
+    yeniden oluşturulur, böylece üst süreçten kalan bağlantılar paylaşılmaz.
+
+    Returns:
+        requests.Session: Paylaşılan oturum.
+    """
+    global _session, _session_pid
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            pool_size = int(os.environ.get("NYMAI_TRANSLATION_CONCURRENCY", 8))
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session, _session_pid = session, os.getpid()
+        return _session
+
+class _PooledRequests:
+    """
+    `deep_translator.google` modülünün kullandığı `requests` modülünün yerine geçer. `GoogleTranslator`
+    her çeviride `requests.get` çağırdığı için istekler bu sayede paylaşılan oturum üzerinden gönderilir.
+    """
+
+    def get(self, *args, **kwargs):
+        return http_session().get(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+deep_translator.google.requests = _PooledRequests()
+
+class GoogleTranslatorBackend(Translator):
+    """
+    `deep_translator.GoogleTranslator` üzerinden ağ ile çeviri yapan arka uç. İstekler `http_session`
+    ile paylaşılan HTTP oturumunun bağlantı havuzunu kullanır. Servis toplu istek desteklemediği için
+    toplu çevirilerde istekler, süreç başına paylaşılan bir iş parçacığı havuzunda eşzamanlı gönderilir.
+
+    Özellikler:
+        max_concurrency (int): Aynı anda gönderilebilecek en fazla istek sayısı.
+    """
+
+    def __init__(self, max_concurrency=None):
+        self.max_concurrency = max_concurrency or int(os.environ.get("NYMAI_TRANSLATION_CONCURRENCY", 8))
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        """
+        İş parçacığı havuzunu döndürür. Havuz ilk kullanımda ve fork sonrası her süreçte yeniden oluşturulur.
+        """
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="translator")
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def translate(self, text, source, target):
+        return GoogleTranslator(source=source, target=target).translate(text)
+
+    def translate_batch(self, texts, source, target):
+        texts = list(texts)
+        if len(texts) <= 1:
+            return [self.translate(text, source, target) for text in texts]
+        return list(self._pool().map(lambda text: self.translate(text, source, target), texts))
+
+class LocalTranslator(Translator):
+    """
+    Ağ bağlantısı gerektirmeyen sözlük tabanlı arka uç. Sözlükte bulunmayan metinler
+    olduğu gibi döndürülür (identity), böylece hattın çeviri dışındaki maliyeti ölçülebilir.
+
+    Özellikler:
+        dictionary (dict): Hedef dil kodundan {metin: çeviri} sözlüğüne eşleme.
+    """
+
+    def __init__(self, dictionary=None, path=None):
+        self.dictionary = dictionary or {}
+        if path:
+            with open(path, encoding="utf-8") as file:
+                self.dictionary.update(json.load(file))
+
+    def translate(self, text, source, target):
+        return self.dictionary.get(target, {}).get(text, text)
+
+class ReplayTranslator(Translator):
+    """
+    Daha önce kaydedilmiş çevirileri dosyadan sunan arka uç. Dosya, her satırı
+    {"source", "target", "text", "translation"} alanlarını içeren JSON satırlarından oluşur.
+
+    Özellikler:
+        records (dict): (kaynak, hedef, metin) anahtarlarından çevirilere eşleme.
+        fallback (Translator): Kayıtta bulunmayan metinler için kullanılacak arka uç.
+    """
+
+    def __init__(self, path, fallback=None):
+        self.records = {}
+        self.fallback = fallback
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    key = (record["source"], record["target"], record["text"])
+                    self.records[key] = record["translation"]
+
+    def translate(self, text, source, target):
+        try:
+            return self.records[(source, target, text)]
+        except KeyError:
+            if self.fallback is None:
+                raise KeyError(f"Kayıtlı çeviri bulunamadı: ({source}, {target}, {text!r})")
+            return self.fallback.translate(text, source, target)
+
+class RecordingTranslator(Translator):
+    """
+    Başka bir arka uçla yapılan çevirileri `ReplayTranslator` tarafından okunabilecek biçimde dosyaya kaydeder.
+
+    Özellikler:
+        translator (Translator): Çeviriyi yapan asıl arka uç.
+        path (str): Kayıtların ekleneceği dosya yolu.
+    """
+
+    def __init__(self, translator, path):
+        self.translator = translator
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _record(self, texts, translations, source, target):
+        with self._lock, open(self.path, "a", encoding="utf-8") as file:
+            for text, translation in zip(texts, translations):
+                record = {"source": source, "target": target, "text": text, "translation": translation}
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def translate(self, text, source, target):
+        translation = self.translator.translate(text, source, target)
+        self._record([text], [translation], source, target)
+        return translation
+
+    def translate_batch(self, texts, source, target):
+        texts = list(texts)
+        translations = self.translator.translate_batch(texts, source, target)
+        self._record(texts, translations, source, target)
+        return translations
+
+class CachedTranslator(Translator):
+    """
+    Başka bir arka ucun çevirilerini `TranslationCache` ile önbelleğe alır.
+
+    Özellikler:
+        translator (Translator): Önbellekte bulunmayan metinleri çeviren arka uç.
+        cache (TranslationCache): Çevirilerin saklandığı önbellek.
+    """
+
+    def __init__(self, translator, cache):
+        self.translator = translator
+        self.cache = cache
+
+    def translate(self, text, source, target):
+        translation = self.cache.get(source, target, text)
+        if translation is None:
+            translation = self.translator.translate(text, source, target)
+            self.cache.put(source, target, text, translation)
+        return translation
+
+    def translate_batch(self, texts, source, target):
+        texts = list(texts)
+        translations = [self.cache.get(source, target, text) for text in texts]
+        # Yalnızca önbellekte bulunmayan benzersiz metinleri arka uca gönder
+        missing = list(dict.fromkeys(text for text, translation in zip(texts, translations) if translation is None))
+        if missing:
+            found = dict(zip(missing, self.translator.translate_batch(missing, source, target)))
+            for text, translation in found.items():
+                self.cache.put(source, target, text, translation)
+            translations = [found[text] if translation is None else translation for text, translation in zip(texts, translations)]
+        return translations
+
+    async def translate_async(self, text, source, target):
+        translation = self.cache.get(source, target, text)
+        if translation is None:
+            translation = await self.translator.translate_async(text, source, target)
+            self.cache.put(source, target, text, translation)
+        return translation
+
+class CoalescingTranslator(Translator):
+    """
+    Aynı (kaynak, hedef, metin) için eşzamanlı gelen çeviri isteklerini tek bir arka uç çağrısında birleştirir.
+    İlk istek çeviriyi yapar, aynı anda gelen diğer istekler onun sonucunu bekler.
+
+    Özellikler:
+        translator (Translator): Çeviriyi yapan asıl arka uç.
+        flight (SingleFlight): Devam eden çağrıların tutulduğu birleştirici.
+    """
+
+    def __init__(self, translator):
+        self.translator = translator
+        self.flight = SingleFlight()
+
+    def translate(self, text, source, target):
+        return self.flight.do((source, target, text), self.translator.translate, text, source, target)
+
+    def translate_batch(self, texts, source, target):
+        texts = list(texts)
+        # Başka bir çağrıda çevrilmekte olan metinleri bekle, kalanları tek toplu çağrıda çevir
+        claims = {}
+        for text in dict.fromkeys(texts):
+            claims[text] = self.flight.acquire((source, target, text))
+        owned = [text for text, (_, leader) in claims.items() if leader]
+        if owned:
+            try:
+                translations = self.translator.translate_batch(owned, source, target)
+            except BaseException as error:
+                for text in owned:
+                    self.flight.release((source, target, text), claims[text][0], error=error)
+                raise
+            for text, translation in zip(owned, translations):
+                self.flight.release((source, target, text), claims[text][0], translation)
+        return [claims[text][0].result() for text in texts]
+
+    async def translate_async(self, text, source, target):
+        """
+        Çeviriyi olay döngüsünü engellemeden yapar. Aynı metin için iş parçacıklarından ve
+        coroutine'lerden gelen eşzamanlı istekler aynı arka uç çağrısını paylaşır.
+        """
+        return await self.flight.do_async((source, target, text), self.translator.translate_async, text, source, target)
+
+def create_cache():
+    """
+    NYMAI_TRANSLATION_CACHE (sqlite dosya yolu), NYMAI_TRANSLATION_CACHE_SIZE, NYMAI_TRANSLATION_CACHE_DISK_SIZE
+    ve NYMAI_TRANSLATION_CACHE_TTL (saniye) ortam değişkenlerine göre bir çeviri önbelleği oluşturur.
+    NYMAI_TRANSLATION_CACHE_SIZE 0 ise önbellek kullanılmaz.
+
+    Returns:
+        TranslationCache: Oluşturulan önbellek veya None.
+    """
+    memory_size = int(os.environ.get("NYMAI_TRANSLATION_CACHE_SIZE", 10000))
+    if memory_size <= 0:
+        return None
+    ttl = os.environ.get("NYMAI_TRANSLATION_CACHE_TTL")
+    return TranslationCache(
+        memory_size=memory_size,
+        path=os.environ.get("NYMAI_TRANSLATION_CACHE"),
+        disk_size=int(os.environ.get("NYMAI_TRANSLATION_CACHE_DISK_SIZE", 1000000)),
+        ttl=float(ttl) if ttl else None
+    )
+
+def create_translator(backend=None, path=None):
+    """
+    Yapılandırmaya göre bir çeviri arka ucu oluşturur. Argümanlar verilmezse
+    NYMAI_TRANSLATOR (google, local, replay, record) ve NYMAI_TRANSLATION_FILE ortam değişkenleri kullanılır.
+
+    Args:
+        backend (str): Arka uç adı.
+        path (str): Sözlük, kayıt veya tekrar oynatma dosyasının yolu.
+
+    Returns:
+        Translator: Oluşturulan arka uç.
+    """
+    backend = backend or os.environ.get("NYMAI_TRANSLATOR", "google")
+    path = path or os.environ.get("NYMAI_TRANSLATION_FILE")
+    if backend == "google":
+        return GoogleTranslatorBackend()
+    if backend == "local":
+        return LocalTranslator(path=path)
+    if backend == "replay":
+        return ReplayTranslator(path)
+    if backend == "record":
+        return RecordingTranslator(GoogleTranslatorBackend(), path)
+    raise ValueError(f"Bilinmeyen çeviri arka ucu: {backend}")
+
+_translator = None
+
+def get_translator():
+    """
+    Etkin çeviri arka ucunu döndürür; henüz oluşturulmadıysa yapılandırmadan oluşturur
+    Arka uç eşzamanlı aynı istekleri birleştiren `CoalescingTranslator` ile, önbellek kapatılmadıysa
+    ayrıca `CachedTranslator` ile sarılır.
+
+    Returns:
+        Translator: Etkin arka uç.
+    """
+    global _translator
+    if _translator is None:
+        translator = CoalescingTranslator(create_translator())
+        cache = create_cache()
+        _translator = CachedTranslator(translator, cache) if cache else translator
+    return _translator
+
+def set_translator(translator):
+    """
+    Etkin çeviri arka ucunu değiştirir.
+
+    Args:
+        translator (Translator): Kullanılacak arka uç.
+    """
+    global _translator
+    _translator = translator
+
+def cache_stats():
+    """
+    Etkin arka uç önbelleğe alınmışsa önbellek sayaçlarını ve isabet oranını döndürür.
+
+    Returns:
+        dict: Sayaçlar ve isabet oranı; önbellek yoksa boş sözlük.
+    """
+    translator = get_translator()
+    if not isinstance(translator, CachedTranslator):
+        return {}
+    return dict(translator.cache.stats, hit_rate=translator.cache.hit_rate())
+
+def coalescing_stats():
+    """
+    Etkin arka ucun birleştirme sayaçlarını döndürür.
+
+    Returns:
+        dict: Çalıştırılan ve birleştirilen çağrı sayıları; birleştirici yoksa boş sözlük.
+    """
+    translator = get_translator()
+    if isinstance(translator, CachedTranslator):
+        translator = translator.translator
+    if not isinstance(translator, CoalescingTranslator):
+        return {}
+    return dict(translator.flight.stats)
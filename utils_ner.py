@@ -1,3 +1,5 @@
+from collections import Counter
+
 def levenshtein_distance(s1, s2):
     """
     Levenshtein mesafesi hesaplar, yani iki kelime arasındaki edit mesafesi.
@@ -30,28 +32,115 @@ def levenshtein_distance(s1, s2):
     
     return previous_row[-1]
 
+def edit_distance(s1, s2, max_distance=None):
+    """
+    Levenshtein mesafesini Myers/Hyyrö bit-paralel algoritmasıyla hesaplar. Kısa kelimenin her karakteri
+    bir tam sayının bir bitine karşılık geldiği için uzun kelimenin her karakteri tek adımda işlenir.
+    
+    `max_distance` verilirse mesafenin bu değeri aşacağı kesinleştiği anda hesaplama bırakılır: kelime
+    uzunlukları arasındaki fark sınırı aşıyorsa hiç başlanmaz, her adımda ise kalan karakter sayısı
+    çıkarıldığında bile sınırın üzerinde kalan mesafeler elenir.
+    
+    Args:
+        s1 (str): İlk kelime.
+        s2 (str): İkinci kelime.
+        max_distance (int): İlgilenilen en büyük mesafe. Verilmezse sınır uygulanmaz.
+        
+    Returns:
+        int: İki kelime arasındaki Levenshtein mesafesi; mesafe `max_distance` değerini aşıyorsa `max_distance + 1`.
+    """
+    if len(s1) > len(s2):
+        s1, s2 = s2, s1  # Kısa kelime desen (bit vektörü) olarak kullanılır
+    m, n = len(s1), len(s2)
+    if max_distance is not None and n - m > max_distance:
+        return max_distance + 1
+    if m == 0:
+        return n
+    
+    # Desendeki her karakterin geçtiği konumların bit maskeleri
+    peq = {}
+    for i, c in enumerate(s1):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = mask, 0, m  # Dikey pozitif/negatif farklar ve son satırdaki mesafe
+    for j, c in enumerate(s2):
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = (ph << 1) | 1  # İlk satırdaki mesafe her sütunda bir artar
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv & mask
+        # Kalan her karakter mesafeyi en fazla bir azaltabilir
+        if max_distance is not None and score - (n - j - 1) > max_distance:
+            return max_distance + 1
+    
+    return score
+
 def find_closest_word(word, sentence_words):
     """
     Verilen bir kelimenin, cümledeki kelimeler arasında en yakın eşleşeni bulur.
+    Her aday, o ana kadarki en iyi mesafeyi geçemeyeceği anlaşıldığı anda elenir.
     
     Args:
         word (str): Eşleşmesi aranacak kelime.
-        sentence_words (list): Cümledeki kelimelerin listesi.
+        sentence_words (Iterable): Cümledeki kelimeler veya `iter_windows` ile üretilen pencereler.
         
     Returns:
-        str: En yakın eşleşen kelime.
+        str | tuple: En yakın eşleşen kelime; pencereler verildiyse konum bilgileriyle birlikte en yakın pencere.
     """
     closest_word = None
-    min_distance = float('inf')
+    min_distance = None
     
     for sentence_word in sentence_words:
-        distance = levenshtein_distance(word, sentence_word)
-        if distance < min_distance:
+        candidate = sentence_word[0] if isinstance(sentence_word, tuple) else sentence_word
+        distance = edit_distance(word, candidate, None if min_distance is None else min_distance - 1)
+        if min_distance is None or distance < min_distance:
             min_distance = distance
             closest_word = sentence_word
+            if distance == 0:
+                break  # Birebir eşleşme bulundu
     
     return closest_word
 
+def iter_windows(sentence_words, counts):
+    """
+    Cümledeki kelimelerden belirli uzunluklarda alt dizileri, metindeki konumlarıyla birlikte sırayla üretir.
+    Birden fazla uzunluk verilirse hepsi kelimeler üzerinde tek geçişte üretilir. Konumlar, kelimeler tek
+    boşlukla birleştirildiğinde oluşan metne (`text.split(" ")` için orijinal metne) göredir.
+    
+    Args:
+        sentence_words (list): Cümledeki kelimelerin listesi.
+        counts (int | Iterable[int]): Alt dizilerin kelime sayısı veya sayıları.
+        
+    Yields:
+        tuple: (alt dizi, başlangıç karakteri, bitiş karakteri, (ilk kelime, son kelime + 1))
+    """
+    counts = sorted({counts} if isinstance(counts, int) else set(counts))
+    starts = []
+    position = 0
+    for sentence_word in sentence_words:
+        starts.append(position)
+        position += len(sentence_word) + 1
+    
+    for i in range(len(sentence_words)):
+        for count in counts:
+            j = i + count
+            if j > len(sentence_words):
+                break
+            window = " ".join(sentence_words[i:j])
+            stripped = window.strip()  # Boş kelimelerden gelen kenar boşlukları konumlara da yansıtılır
+            start = starts[i] + len(window) - len(window.lstrip())
+            yield stripped, start, start + len(stripped), (i, j)
+
 def create_distance_list(sentence_words, count):
     """
     Cümledeki kelimelerden belirli uzunlukta alt diziler oluşturur.
@@ -63,11 +152,107 @@ def create_distance_list(sentence_words, count):
     Returns:
         list: Belirtilen uzunlukta kelime dizileri içeren liste.
     """
-    return_list = []
-    for i in range(0, len(sentence_words) - count + 1):
-        temp = ""
-        for b in range(i, i + count):
-            temp += sentence_words[b] + " "
-        return_list.append(temp.strip())  # Boşluklardan arındırılmış dizi
-    
-    return return_list
+    return [window for window, _, _, _ in iter_windows(sentence_words, count)]
+
+class FuzzyWindowIndex:
+    """
+    Bir metnin kelime pencereleri üzerinde q-gram indeksi. Metin için bir kez oluşturulur ve tüm
+    varlıkların en yakın pencere aramasında tekrar kullanılır.
+    
+    Her pencere için, varlıkla paylaştığı q-gram sayısından edit mesafesinin alt sınırı hesaplanır
+    (her düzenleme işlemi en fazla q adet q-gramı bozar). Adaylar alt sınıra göre sıralanarak işlenir ve alt
+    sınırı bulunan en iyi mesafeyi geçen pencereler için edit mesafesi hiç hesaplanmaz. Sonuç,
+    `find_closest_word(word, create_distance_list(words, count))` ile aynıdır.
+    
+    Özellikler:
+        words (list): Metnin kelimeleri.
+        q (int): q-gram uzunluğu.
+    """
+    
+    def __init__(self, words, q=2):
+        self.words = list(words)
+        self.q = q
+        self._indexes = {}
+    
+    def _qgrams(self, text):
+        """
+        Metnin q-gramlarını sayılarıyla döndürür.
+        """
+        return Counter(text[i:i + self.q] for i in range(len(text) - self.q + 1))
+    
+    def _index(self, count):
+        """
+        Verilen kelime sayısındaki pencereleri ve q-gram kayıt listelerini ilk kullanımda oluşturur.
+        
+        Returns:
+            tuple: (`iter_windows` pencereleri, q-gram -> [(pencere indeksi, sayı)] kayıt listeleri)
+        """
+        index = self._indexes.get(count)
+        if index is None:
+            windows = list(iter_windows(self.words, count))
+            postings = {}
+            for i, (window, _, _, _) in enumerate(windows):
+                for gram, n in self._qgrams(window).items():
+                    postings.setdefault(gram, []).append((i, n))
+            index = self._indexes[count] = (windows, postings)
+        return index
+    
+    def _scan(self, word, windows, shared, candidates, closest, best):
+        """
+        Adayları edit mesafesi alt sınırına göre sıralı inceler ve en yakın pencereyi günceller.
+        
+        Returns:
+            tuple: (en yakın pencerenin indeksi, mesafesi)
+        """
+        bounds = sorted(
+            # Alt sınır: max(|P|, |W|) - q + 1 - paylaşılan <= q * mesafe
+            (max(0, -(-(max(len(word), len(windows[i][0])) - self.q + 1 - shared[i]) // self.q)), i)
+            for i in candidates
+        )
+        for bound, i in bounds:
+            if best is not None and bound > best:
+                break  # Kalan pencerelerin hiçbiri en iyi mesafeyi geçemez
+            if best is not None and bound == best and i > closest:
+                continue  # Eşit mesafede önce gelen pencere zaten bulundu
+            distance = edit_distance(word, windows[i][0], best)
+            if best is None or distance < best or (distance == best and i < closest):
+                closest, best = i, distance
+        return closest, best
+    
+    def closest(self, word, count=None):
+        """
+        Varlığa edit mesafesi en küçük olan pencereyi bulur. Eşit mesafelerde metinde önce gelen pencere seçilir.
+        
+        Args:
+            word (str): Eşleşmesi aranacak ifade.
+            count (int): Pencerelerin kelime sayısı. Verilmezse ifadenin kelime sayısı kullanılır.
+            
+        Returns:
+            str: En yakın pencere veya metin yeterince uzun değilse None.
+        """
+        window = self.closest_window(word, count)
+        return window[0] if window is not None else None
+    
+    def closest_window(self, word, count=None):
+        """
+        `closest` ile aynı aramayı yapar ve pencereyi metindeki konumlarıyla birlikte döndürür.
+        
+        Returns:
+            tuple: (pencere, başlangıç karakteri, bitiş karakteri, kelime aralığı) veya metin yeterince uzun değilse None.
+        """
+        windows, postings = self._index(count or len(word.split(" ")))
+        
+        # Her pencerenin varlıkla paylaştığı q-gram sayısı (sayım filtresi)
+        shared = [0] * len(windows)
+        for gram, n in self._qgrams(word).items():
+            for i, m in postings.get(gram, ()):
+                shared[i] += min(n, m)
+        
+        # Önce q-gram paylaşan pencereler incelenir; ortak q-gramı olmayan pencerelerin alt sınırı en az
+        # `unshared_bound` olduğundan bu pencerelere yalnızca bulunan en iyi mesafe bu değerden küçük değilse bakılır
+        closest, best = self._scan(word, windows, shared, [i for i, n in enumerate(shared) if n], None, None)
+        unshared_bound = max(0, -(-(len(word) - self.q + 1) // self.q))
+        if best is None or unshared_bound <= best:
+            closest, best = self._scan(word, windows, shared, [i for i, n in enumerate(shared) if not n], closest, best)
+        
+        return windows[closest] if closest is not None else None
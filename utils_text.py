@@ -1,5 +1,9 @@
+import asyncio
+import math
 import re
-from deep_translator import GoogleTranslator
+from collections import Counter
+from translators import get_translator
+from text_alignment import align_translation, translate_aligned_batch
 from nltk.corpus import stopwords
 
 def simple_stem(word):
@@ -56,9 +60,165 @@ def space_handler(text):
     text = text.replace("\n","")   # Yeni satır karakterlerini kaldır
     return text
 
+# Dil profillerinin çıkarıldığı örnek metinler (karakter üçlüleri bu metinlerden sayılır)
+LANGUAGE_SAMPLES = {
+    "en": (
+        "the of and to in is that it was for on are as with his they at be this have from or one had by "
+        "but not what all were we when your can said there use an each which she do how their if will up "
+        "other about out many then them these so some her would make like him into time has look two more "
+        "write go see number no way could people my than first been call who its now find long down day did "
+        "get come made may part new very after service company customer great good bad really just our "
+        "because should why would never again thank you thanks please today product phone internet bank "
+        "the service was terrible and the staff did not help us at all we are very happy with the new app "
+        "i would like to thank the company for their support this is the worst experience i have ever had "
+        "the flight was delayed again and nobody explained anything to the passengers "
+        "my card was blocked by the bank yesterday and i am still waiting for an answer from customer support "
+        "we love this campaign it is amazing and everyone should try it the shipment never arrived "
+        "they have been working on the network for weeks but the connection is still slow and unreliable "
+        "thanks for the quick response the chairman of the executive board joined our team this morning "
+        "what a disappointing update the price went up while the quality went down nothing works anymore"
+    ),
+    "tr": (
+        "ve bir bu da de için ile çok ne daha ama gibi olarak olan kadar sonra var yok ben sen biz siz onlar "
+        "şu her hiç en mi mı mu mü değil diye bile ise şey zaman gün yıl yeni büyük iyi kötü güzel başka "
+        "kendi nasıl neden çünkü artık hala hemen şimdi bugün yarın dün hizmet şirket müşteri teşekkür "
+        "ederim ediyoruz lütfen internet telefon banka uygulama başkanı kurulu aramıza katıldı hizmetten "
+        "memnun değilim müşteri hizmetleri hiç yardımcı olmadı yeni uygulamadan çok memnunuz şirketin "
+        "desteği için teşekkür ederiz bu hayatımda yaşadığım en kötü deneyim faturamı ödedim ama hattım açılmadı "
+        "uçuşum yine rötar yaptı ve kimse yolculara bir açıklama yapmadı "
+        "banka dün kartımı bloke etti ve hala müşteri hizmetlerinden cevap bekliyorum "
+        "bu kampanyaya bayıldık harika herkese tavsiye ederim kargom hala gelmedi "
+        "haftalardır şebeke üzerinde çalışıyorlar ama bağlantı hala yavaş ve güvenilmez "
+        "hızlı cevabınız için teşekkürler icra kurulu başkanı bu sabah ekibimize katıldı "
+        "ne kadar hayal kırıklığı yaratan bir güncelleme fiyat arttı kalite düştü artık hiçbir şey çalışmıyor "
+        "siparişimi iptal ettiler paramı iade etmediler yarın tekrar arayacağım"
+    ),
+}
+TURKISH_CHARACTERS = set("çğıöşü")
+
+# Bu uzunluğu aşan metinler parçalara bölünerek eşzamanlı çevrilir
+MAX_CHUNK_CHARS = 1000
+
+# Dil algılama sayesinde atlanan ve yapılan çeviri sayıları
+translation_stats = {"skipped": 0, "translated": 0}
+
+def _words(text):
+    """
+    Metindeki harflerden oluşan kelimeleri küçük harfe çevirerek döndürür.
+    """
+    return re.findall(r"[^\W\d_]+", text.replace("İ", "i").lower())
+
+def _trigrams(word):
+    """
+    Kelimenin başına ve sonuna boşluk ekleyerek karakter üçlülerini çıkarır.
+    """
+    padded = f" {word} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+def _build_language_profiles():
+    """
+    Örnek metinlerden her dil için karakter üçlüsü log-olasılık profilleri oluşturur (add-one yumuşatma).
+    """
+    profiles = {}
+    for language, sample in LANGUAGE_SAMPLES.items():
+        counts = Counter(gram for word in _words(sample) for gram in _trigrams(word))
+        denominator = sum(counts.values()) + len(counts) + 1
+        profile = {gram: math.log((count + 1) / denominator) for gram, count in counts.items()}
+        profiles[language] = (profile, math.log(1 / denominator))
+    return profiles
+
+LANGUAGE_PROFILES = _build_language_profiles()
+
+def detect_language(text, min_letters=12, min_margin=0.1, max_mixed=0.3):
+    """
+    Metnin dilini ağ bağlantısı olmadan karakter üçlüsü profilleriyle tahmin eder.
+    Kısa, karışık veya belirsiz metinlerde tahmin yapılmaz.
+    
+    Args:
+        text (str): Dili belirlenecek metin.
+        min_letters (int): Tahmin için gereken en az harf sayısı.
+        min_margin (float): Üçlü başına en iyi iki dil arasındaki en küçük skor farkı.
+        max_mixed (float): İkinci dile ait kelimelerin izin verilen en yüksek oranı.
+        
+    Returns:
+        str: Dil kodu ('en' veya 'tr') ya da emin olunamazsa None.
+    """
+    words = _words(text)
+    if sum(len(word) for word in words) < min_letters:
+        return None
+    totals = {language: 0.0 for language in LANGUAGE_PROFILES}
+    wins = Counter()
+    num_grams = 0
+    for word in words:
+        grams = _trigrams(word)
+        scores = {
+            language: sum(profile.get(gram, unseen) for gram in grams)
+            for language, (profile, unseen) in LANGUAGE_PROFILES.items()
+        }
+        # Türkçeye özgü harfler güçlü bir işarettir
+        if any(c in TURKISH_CHARACTERS for c in word):
+            scores["tr"] += 2.0 * len(grams)
+        for language, score in scores.items():
+            totals[language] += score
+        num_grams += len(grams)
+        if len(word) > 2:
+            wins[max(scores, key=scores.get)] += 1
+
+    best, second = sorted(totals, key=totals.get, reverse=True)
+    if (totals[best] - totals[second]) / num_grams < min_margin:
+        return None
+    voted = sum(wins.values())
+    if voted and wins[second] / voted >= max_mixed:
+        return None
+    return best
+
+def _translate_batch_aligned(texts, target):
+    """
+    Metinleri hedef dile çevirir ve her metin için kaynak ile çeviri arasındaki parça eşleşmelerini döndürür.
+    Dili zaten hedef dil olarak algılanan metinler çevrilmeden kendileriyle eşlenir. Uzun metinler cümle
+    parçalarına bölünerek çevrildiği için parçaların orijinal metindeki aralıkları birebir korunur; bütün
+    halinde çevrilen metinlerin cümleleri çeviriden sonra eşleştirilir.
+    """
+    texts = list(texts)
+    alignments = [None] * len(texts)
+    pending = [i for i, text in enumerate(texts) if detect_language(text) != target]
+    translation_stats["skipped"] += len(texts) - len(pending)
+    translation_stats["translated"] += len(pending)
+    # Uzun metinleri cümle parçalarına bölerek çevir; parçaların eşleşmeleri sonraki aşamalar için saklanır
+    long_texts = [i for i in pending if len(texts[i]) > MAX_CHUNK_CHARS]
+    if long_texts:
+        chunked = translate_aligned_batch(
+            [texts[i] for i in long_texts],
+            lambda pieces: _translate_batch(pieces, target),
+            max_chars=MAX_CHUNK_CHARS,
+            merge=True
+        )
+        for i, alignment in zip(long_texts, chunked):
+            alignments[i] = alignment
+        translation_stats["translated"] -= len(long_texts)  # Parçalar ayrıca sayıldı
+        pending = [i for i in pending if i not in long_texts]
+
+    translator = get_translator()
+    if len(pending) == 1:
+        translations = [translator.translate(texts[pending[0]], 'auto', target)]
+    elif pending:
+        translations = translator.translate_batch([texts[i] for i in pending], 'auto', target)
+    else:
+        translations = []
+    for i, translation in zip(pending, translations):
+        alignments[i] = align_translation(texts[i], translation)
+    return [alignment or align_translation(text, text) for text, alignment in zip(texts, alignments)]
+
+def _translate_batch(texts, target):
+    """
+    Metinleri hedef dile çevirir; dili zaten hedef dil olarak algılanan metinler çevrilmeden döndürülür.
+    """
+    return [alignment.target for alignment in _translate_batch_aligned(texts, target)]
+
 def translate_to_en(text):
     """
     Verilen metni otomatik olarak algılanan dilden İngilizceye çevirir.
+    Metin zaten İngilizce olarak algılanırsa çeviri yapılmaz.
     
     Args:
         text (str): Çevrilecek metin.
@@ -66,12 +226,60 @@ def translate_to_en(text):
     Returns:
         str: İngilizce çevirisi yapılmış metin.
     """
-    text = GoogleTranslator(source='auto', target='en').translate(text)
+    text, = _translate_batch([text], 'en')
     return text
 
+def translate_to_en_aligned(text):
+    """
+    Verilen metni İngilizceye çevirir ve çeviri cümlelerinin kaynak metindeki karşılıklarını kaydeder.
+    Böylece çeviride bulunan varlıklar orijinal metne geri yansıtılabilir.
+    
+    Args:
+        text (str): Çevrilecek metin.
+        
+    Returns:
+        TranslationAlignment: İngilizce çeviriyi (`target`) ve parça eşleşmelerini içeren nesne.
+    """
+    alignment, = translate_batch_to_en_aligned([text])
+    return alignment
+
+async def translate_to_en_aligned_async(text):
+    """
+    `translate_to_en_aligned` fonksiyonunun asyncio karşılığı. Bütün halinde çevrilen metinlerin çevirisi
+    olay döngüsünde `translate_async` ile beklenir; böylece aynı metni isteyen eşzamanlı istekler tek arka uç
+    çağrısında birleştirilir. Çeviri gerektirmeyen ve parçalara bölünen uzun metinler iş parçacığı havuzunda işlenir.
+    
+    Args:
+        text (str): Çevrilecek metin.
+        
+    Returns:
+        TranslationAlignment: İngilizce çeviriyi (`target`) ve parça eşleşmelerini içeren nesne.
+    """
+    if len(text) <= MAX_CHUNK_CHARS and detect_language(text) != 'en':
+        translation_stats["translated"] += 1
+        translation = await get_translator().translate_async(text, 'auto', 'en')
+        return align_translation(text, translation)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, translate_to_en_aligned, text)
+
+def translate_batch_to_en_aligned(texts):
+    """
+    Metin listesini tek bir toplu çağrıyla İngilizceye çevirir ve çeviri sırasında oluşan parça eşleşmelerini
+    döndürür. Kısa metinler bütün halinde çevrildiği için cümleler arası bağlam korunur; uzun metinlerin
+    parçalarının orijinal metindeki aralıkları birebir saklanır ve `change_tr_ner` bunları kullanır.
+    
+    Args:
+        texts (list): Çevrilecek metinlerin listesi.
+        
+    Returns:
+        list: Her metin için `TranslationAlignment` nesnesi (girdi sırasıyla).
+    """
+    return _translate_batch_aligned(texts, 'en')
+
 def translate_to_tr(text):
     """
     Verilen metni otomatik olarak algılanan dilden Türkçeye çevirir.
+    Metin zaten Türkçe olarak algılanırsa çeviri yapılmaz.
     
     Args:
         text (str): Çevrilecek metin.
@@ -79,9 +287,33 @@ def translate_to_tr(text):
     Returns:
         str: Türkçe çevirisi yapılmış metin.
     """
-    text = GoogleTranslator(source='auto', target='tr').translate(text)
+    text, = _translate_batch([text], 'tr')
     return text
 
+def translate_batch_to_en(texts):
+    """
+    Verilen metin listesini otomatik olarak algılanan dilden İngilizceye çevirir.
+    
+    Args:
+        texts (list): Çevrilecek metinlerin listesi.
+        
+    Returns:
+        list: Girdi sırasıyla İngilizce çevirileri içeren liste.
+    """
+    return _translate_batch(texts, 'en')
+
+def translate_batch_to_tr(texts):
+    """
+    Verilen metin listesini otomatik olarak algılanan dilden Türkçeye çevirir.
+    
+    Args:
+        texts (list): Çevrilecek metinlerin listesi.
+        
+    Returns:
+        list: Girdi sırasıyla Türkçe çevirileri içeren liste.
+    """
+    return _translate_batch(texts, 'tr')
+
 def capitalize_first_letter(sentence):
     """
     Cümledeki her kelimenin ilk harfini büyük yapar.